@@ -0,0 +1,248 @@
+"""
+Benchmark for the Django API with stubbed upstreams.
+
+Starts local stand-ins for the Express data service and the sentiment analyzer
+(see stubs.py), serves the Django project against them on a throwaway SQLite
+database, then drives each endpoint with concurrent keep-alive clients and
+reports throughput and p50/p95/p99 latency. Run from the `server` directory:
+
+    python -m benchmarks.run --concurrency 16 --requests 2000 --output before.json
+    python -m benchmarks.run --upstream-latency 40 --error-rate 0.02 --output slow.json
+    python -m benchmarks.run --compare before.json after.json
+
+Upstream latency, jitter and error rate are injected by the stubs, so runs are
+repeatable and compare the Django side only.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from . import stubs
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USERNAME = "bench-user"
+PASSWORD = "bench-password-123"
+
+REVIEW = {
+    "name": "Bench User", "dealership": 15, "review": "Great service and a fair price",
+    "purchase": True, "purchase_date": "07/11/2020", "car_make": "Audi", "car_model": "A6", "car_year": 2020,
+}
+
+# name -> (method, path, body builder or None, needs session)
+ENDPOINTS = {
+    "get_dealers": ("GET", "/api/get_dealers/", None, False),
+    "dealer_reviews": ("GET", "/api/reviews/dealer/15/", None, False),
+    "add_review": ("POST", "/api/add_review/", lambda: json.dumps(REVIEW), True),
+    "get_cars": ("GET", "/api/get_cars/", None, False),
+}
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _client(host, port, method, path, make_body, headers, count):
+    """Issues `count` requests over one keep-alive connection; returns (latencies_ms, errors)."""
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    latencies, errors = [], 0
+    for _ in range(count):
+        body = make_body() if make_body else None
+        started = time.perf_counter()
+        try:
+            connection.request(method, path, body=body, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+            failed = response.status != 200
+            if not failed and payload[:1] == b"{":
+                # ✅ The views report upstream failures in the body with HTTP 200
+                failed = json.loads(payload).get("status", 200) != 200
+        except (OSError, http.client.HTTPException, ValueError):
+            failed = True
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+        latencies.append((time.perf_counter() - started) * 1000)
+        errors += failed
+    connection.close()
+    return latencies, errors
+
+
+def measure(base_url, name, concurrency, requests, session_cookie=None):
+    method, path, make_body, needs_session = ENDPOINTS[name]
+    host, port = base_url.split("//", 1)[1].split(":")
+    headers = {"Content-Type": "application/json"}
+    if needs_session:
+        headers["Cookie"] = f"sessionid={session_cookie}"
+
+    per_client = [requests // concurrency + (i < requests % concurrency) for i in range(concurrency)]
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(
+            lambda count: _client(host, int(port), method, path, make_body, headers, count), per_client))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(value for values, _ in results for value in values)
+    errors = sum(failed for _, failed in results)
+    return {
+        "endpoint": name,
+        "path": path,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "max_ms": round(latencies[-1], 2),
+    }
+
+
+def _manage(env, *args):
+    subprocess.run([sys.executable, "manage.py", *args], cwd=SERVER_DIR, env=env, check=True,
+                   stdout=subprocess.DEVNULL)
+
+
+def start_django(env, port, server, workers):
+    if server == "gunicorn":
+        command = [sys.executable, "-m", "gunicorn", "djangoproj.wsgi:application",
+                   "--bind", f"127.0.0.1:{port}", "--workers", str(workers), "--threads", "4"]
+    elif server == "uvicorn":
+        command = [sys.executable, "-m", "uvicorn", "djangoproj.asgi:application",
+                   "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers), "--log-level", "warning"]
+    else:
+        command = [sys.executable, "manage.py", "runserver", "--noreload", f"127.0.0.1:{port}"]
+    return subprocess.Popen(command, cwd=SERVER_DIR, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def wait_ready(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/api/get_cars/", timeout=2):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+def register_session(base_url):
+    """Registers (or logs in) the benchmark user and returns its session id."""
+    body = json.dumps({"userName": USERNAME, "password": PASSWORD, "firstName": "Bench",
+                       "lastName": "User", "email": "bench@example.com"}).encode("utf-8")
+    for path in ("/register/", "/login/"):
+        request = urllib.request.Request(f"{base_url}{path}", data=body,
+                                         headers={"Content-Type": "application/json"})
+        try:
+            with urllib.request.urlopen(request, timeout=10) as response:
+                for header in response.headers.get_all("Set-Cookie") or []:
+                    if header.startswith("sessionid="):
+                        return header.split(";", 1)[0].split("=", 1)[1]
+        except urllib.error.HTTPError as e:
+            if e.code != 409:  # ✅ 409: already registered by an earlier run, so log in instead
+                raise
+    raise RuntimeError("could not obtain a session for add_review")
+
+
+def run(args):
+    fault = stubs.Fault(args.upstream_latency, args.upstream_jitter, args.error_rate)
+    backend, backend_url = stubs.start_stub(
+        stubs.backend_routes(args.dealers, args.reviews_per_dealer, args.scored_fraction), fault)
+    analyzer, analyzer_url = stubs.start_stub(stubs.analyzer_routes(), fault)
+
+    env = dict(os.environ, DJANGO_SETTINGS_MODULE="benchmarks.settings",
+               backend_url=backend_url, sentiment_analyzer_url=analyzer_url,
+               BENCH_DB_PATH=args.db_path, PYTHONPATH=SERVER_DIR)
+    if os.path.exists(args.db_path):
+        os.remove(args.db_path)
+    _manage(env, "migrate", "--noinput")
+    _manage(env, "seed_catalog")
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    server = start_django(env, args.port, args.server, args.workers)
+    try:
+        wait_ready(base_url)
+        session = register_session(base_url)
+        results = []
+        for name in args.endpoints.split(","):
+            # ✅ Warm caches and connection pools before timing
+            measure(base_url, name, args.concurrency, min(args.requests, args.concurrency * 5), session)
+            result = measure(base_url, name, args.concurrency, args.requests, session)
+            results.append(result)
+            print(f"{name:<16} {result['rps']:>9.1f} req/s  p50 {result['p50_ms']:>8.2f} ms  "
+                  f"p95 {result['p95_ms']:>8.2f} ms  p99 {result['p99_ms']:>8.2f} ms  errors {result['errors']}",
+                  flush=True)
+    finally:
+        server.terminate()
+        server.wait()
+        backend.shutdown()
+        analyzer.shutdown()
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "config": {key: value for key, value in vars(args).items() if key not in ("output", "compare")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(report, handle, indent=2)
+        print(f"saved {args.output}")
+    return report
+
+
+def compare(before_path, after_path):
+    """Prints per-endpoint throughput and latency changes between two saved runs."""
+    with open(before_path) as handle:
+        before = {result["endpoint"]: result for result in json.load(handle)["results"]}
+    with open(after_path) as handle:
+        after = {result["endpoint"]: result for result in json.load(handle)["results"]}
+
+    for name in after:
+        if name not in before:
+            continue
+        changes = []
+        for metric in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+            old, new = before[name][metric], after[name][metric]
+            delta = (new - old) / old * 100 if old else 0.0
+            changes.append(f"{metric} {old} -> {new} ({delta:+.1f}%)")
+        print(f"{name:<16} " + "  ".join(changes))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Django API against stubbed upstreams.")
+    parser.add_argument("--endpoints", default=",".join(ENDPOINTS), help="Comma-separated endpoint names.")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent keep-alive clients.")
+    parser.add_argument("--requests", type=int, default=1000, help="Requests per endpoint.")
+    parser.add_argument("--server", choices=("runserver", "gunicorn", "uvicorn"), default="runserver")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for gunicorn/uvicorn.")
+    parser.add_argument("--port", type=int, default=8077)
+    parser.add_argument("--upstream-latency", type=float, default=5.0, help="Mean stub latency in ms.")
+    parser.add_argument("--upstream-jitter", type=float, default=2.0, help="Stub latency jitter in ms.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of stub requests that fail.")
+    parser.add_argument("--dealers", type=int, default=50)
+    parser.add_argument("--reviews-per-dealer", type=int, default=20)
+    parser.add_argument("--scored-fraction", type=float, default=0.5,
+                        help="Fraction of stub reviews that already carry a sentiment.")
+    parser.add_argument("--db-path", default=os.path.join("/tmp", "djangoapp-bench.sqlite3"))
+    parser.add_argument("--output", help="Save the results as JSON here.")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two saved runs.")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args)
+
+
+if __name__ == "__main__":
+    main()
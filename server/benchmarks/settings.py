@@ -0,0 +1,15 @@
+"""Django settings for benchmark runs: the real settings with a throwaway database."""
+import os
+
+from djangoproj.settings import *  # noqa: F401,F403
+
+DEBUG = False
+DATABASES = {
+    'default': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('BENCH_DB_PATH', '/tmp/djangoapp-bench.sqlite3'),
+    }
+}
+# Console-only logging so runs don't need (or fill) logs/django.log
+LOGGING = {'version': 1, 'disable_existing_loggers': False}
+STATICFILES_STORAGE = 'django.contrib.staticfiles.storage.StaticFilesStorage'
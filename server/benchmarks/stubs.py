@@ -0,0 +1,131 @@
+"""
+Local stand-ins for the Express data service and the sentiment analyzer.
+
+Both answer the routes the Django app calls, after an injected delay, and fail
+a configurable fraction of requests with HTTP 500.
+"""
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+
+STATES = ["Texas", "Minnesota", "California", "New York", "Kansas"]
+
+
+class Fault:
+    """Latency (mean +/- jitter, in ms) and error-rate injection shared by the stubs."""
+
+    def __init__(self, latency_ms=0.0, jitter_ms=0.0, error_rate=0.0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+
+    def apply(self):
+        delay = self.latency_ms + random.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000)
+        return random.random() < self.error_rate
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like the real services
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+    fault = Fault()
+    routes = []  # [(method, compiled regex, handler(match, body) -> object)]
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        if self.fault.apply():
+            return self._send(500, {"error": "injected failure"})
+        path = urlsplit(self.path).path
+        for route_method, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if route_method == method and match:
+                return self._send(200, handler(match, body))
+        self._send(404, {"error": "not found"})
+
+    def _send(self, status, payload):
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+
+def _dealer(dealer_id):
+    return {"id": dealer_id, "city": "El Paso", "state": STATES[dealer_id % len(STATES)], "address": "3 Nova Court",
+            "zip": "88563", "lat": "31.6948", "long": "-106.3", "short_name": f"Dealer{dealer_id}",
+            "full_name": f"Dealer {dealer_id} Car Dealership"}
+
+
+def _review(review_id, dealer_id, scored):
+    review = {"id": review_id, "name": "Berkly Shepley", "dealership": dealer_id,
+              "review": f"Total grid-enabled service-desk {review_id % 50}", "purchase": True,
+              "purchase_date": "07/11/2020", "car_make": "Audi", "car_model": "A6", "car_year": 2010}
+    if scored:
+        review["sentiment"] = "positive"
+    return review
+
+
+def backend_routes(dealers, reviews_per_dealer, scored_fraction):
+    """Routes of the Express data service used by the Django views."""
+    all_dealers = [_dealer(i) for i in range(1, dealers + 1)]
+    counter = {"next": 10 ** 6}
+    lock = threading.Lock()
+
+    def reviews(match, body):
+        dealer_id = int(match.group(1))
+        return [_review(dealer_id * 10000 + i, dealer_id, random.random() < scored_fraction)
+                for i in range(reviews_per_dealer)]
+
+    def insert(match, body):
+        data = json.loads(body or b"{}")
+        with lock:
+            counter["next"] += 1
+            data["id"] = counter["next"]
+        return data
+
+    return [
+        ("GET", re.compile(r"/fetchDealers"), lambda m, b: all_dealers),
+        ("GET", re.compile(r"/fetchDealers/([^/]+)"),
+         lambda m, b: [d for d in all_dealers if d["state"] == unquote(m.group(1))]),
+        ("GET", re.compile(r"/fetchDealer/(\d+)"), lambda m, b: _dealer(int(m.group(1)))),
+        ("GET", re.compile(r"/fetchReviews/dealer/(\d+)"), reviews),
+        ("POST", re.compile(r"/insert_review"), insert),
+    ]
+
+
+def analyzer_routes():
+    """Routes of the Flask sentiment analyzer."""
+    def label(text):
+        return ("positive", "neutral", "negative")[len(text) % 3]
+
+    return [
+        ("GET", re.compile(r"/analyze/(.+)"), lambda m, b: {"sentiment": label(unquote(m.group(1)))}),
+        ("POST", re.compile(r"/analyze/batch"),
+         lambda m, b: {"sentiments": [{"sentiment": label(t if isinstance(t, str) else t.get("text", ""))}
+                                      for t in json.loads(b or b"[]")]}),
+    ]
+
+
+def start_stub(routes, fault, port=0):
+    """Starts a stub server on a background thread; returns (server, base_url)."""
+    handler = type("Handler", (StubHandler,), {"routes": routes, "fault": fault})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
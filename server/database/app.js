@@ -1,6 +1,6 @@
+const crypto = require('crypto');
 const express = require('express');
 const mongoose = require('mongoose');
-const fs = require('fs');
 const cors = require('cors');
 const app = express();
 const port = 3030;
@@ -8,25 +8,26 @@ const port = 3030;
 app.use(cors());
 app.use(require('body-parser').urlencoded({ extended: false }));
 
-const reviews_data = JSON.parse(fs.readFileSync("reviews.json", 'utf8'));
-const dealerships_data = JSON.parse(fs.readFileSync("dealerships.json", 'utf8'));
-
-mongoose.connect("mongodb://mongo_db:27017/", { dbName: 'dealershipsDB' });
+mongoose.connect(process.env.MONGO_URL || "mongodb://mongo_db:27017/", { dbName: 'dealershipsDB' });
 
 const Reviews = require('./review');
 const Dealerships = require('./dealership');
+const Counters = require('./counter');
+const { sendPage } = require('./pagination');
+const { getReviewStats, rebuildReviewStats, recordReview } = require('./review_stats');
+const Cars = require('./inventory');
+const { searchReviews } = require('./review_search');
+const { carFacets, carFilter, seedDealerInventory } = require('./inventory_search');
+const { seedAll } = require('./seeding');
 
-try {
-    Reviews.deleteMany({}).then(() => {
-        Reviews.insertMany(reviews_data['reviews']);
-    });
-    Dealerships.deleteMany({}).then(() => {
-        Dealerships.insertMany(dealerships_data['dealerships']);
-    });
+// Lean reads return plain objects (no Mongoose hydration) without the version key
+const PROJECTION = { __v: 0 };
 
-} catch (error) {
-    res.status(500).json({ error: 'Error fetching documents' });
-}
+// Non-destructive boot: seed files are applied only when their checksum changed,
+// as upserts by id, so reviews posted since the last boot survive a restart
+seedAll({ reviews: "reviews.json", dealerships: "dealerships.json", cars: "car_records.json" }).catch((error) => {
+    console.log(error);
+});
 
 // Express route to home
 app.get('/', async (req, res) => {
@@ -34,10 +35,12 @@ app.get('/', async (req, res) => {
 });
 
 // Express route to fetch all reviews
+// (?missing_sentiment=1 returns only legacy reviews that have no stored sentiment;
+// ?limit/&cursor pages and ?format=ndjson streams, see pagination.js)
 app.get('/fetchReviews', async (req, res) => {
     try {
-        const documents = await Reviews.find();
-        res.json(documents);
+        const filter = req.query.missing_sentiment ? { sentiment: { $exists: false } } : {};
+        await sendPage(Reviews, filter, req, res, PROJECTION);
     } catch (error) {
         res.status(500).json({ error: 'Error fetching documents' });
     }
@@ -46,18 +49,54 @@ app.get('/fetchReviews', async (req, res) => {
 // Express route to fetch reviews by a particular dealer
 app.get('/fetchReviews/dealer/:id', async (req, res) => {
     try {
-        const documents = await Reviews.find({ dealership: req.params.id });
-        res.json(documents);
+        await sendPage(Reviews, { dealership: req.params.id }, req, res, PROJECTION);
     } catch (error) {
         res.status(500).json({ error: 'Error fetching documents' });
     }
 });
 
+// Express route for ranked keyword search over review text
+// (?q required; dealer, make, model, year and sentiment filter; limit/cursor page)
+app.get('/searchReviews', async (req, res) => {
+    if (!req.query.q || !String(req.query.q).trim()) {
+        return res.status(400).json({ error: 'q is required' });
+    }
+    try {
+        const page = await searchReviews(req.query, PROJECTION);
+        if (page === null) {
+            return res.status(400).json({ error: 'Invalid cursor' });
+        }
+        res.json(page);
+    } catch (error) {
+        console.log(error);
+        res.status(500).json({ error: 'Error searching reviews' });
+    }
+});
+
+// Express route to fetch a dealer's precomputed review summary
+app.get('/fetchReviewStats/dealer/:id', async (req, res) => {
+    try {
+        res.json(await getReviewStats(parseInt(req.params.id)));
+    } catch (error) {
+        res.status(500).json({ error: 'Error fetching review stats' });
+    }
+});
+
+// Express route to recompute review aggregates (body: optional JSON array of dealer ids)
+app.post('/rebuild_review_stats', express.json(), async (req, res) => {
+    try {
+        const dealerIds = Array.isArray(req.body) && req.body.length ? req.body : undefined;
+        res.json({ rebuilt: await rebuildReviewStats(dealerIds) });
+    } catch (error) {
+        console.log(error);
+        res.status(500).json({ error: 'Error rebuilding review stats' });
+    }
+});
+
 // ✅ [MODIFICATION] Implemented endpoint to fetch all dealerships
 app.get('/fetchDealers', async (req, res) => {
     try {
-        const documents = await Dealerships.find();
-        res.json(documents);
+        await sendPage(Dealerships, {}, req, res, PROJECTION);
     } catch (error) {
         res.status(500).json({ error: 'Error fetching dealerships' });
     }
@@ -66,17 +105,48 @@ app.get('/fetchDealers', async (req, res) => {
 // ✅ [MODIFICATION] Implemented endpoint to fetch dealerships by state
 app.get('/fetchDealers/:state', async (req, res) => {
     try {
-        const documents = await Dealerships.find({ state: req.params.state });
-        res.json(documents);
+        await sendPage(Dealerships, { state: req.params.state }, req, res, PROJECTION);
     } catch (error) {
         res.status(500).json({ error: 'Error fetching dealerships by state' });
     }
 });
 
+// Express route for the dealers nearest a point, closest first
+// (?lat&lng required; radius_km bounds the search, k caps the results)
+const NEAR_DEFAULT_K = 10;
+const NEAR_MAX_K = 100;
+
+app.get('/fetchDealersNear', async (req, res) => {
+    const lat = parseFloat(req.query.lat);
+    const lng = parseFloat(req.query.lng);
+    if (!Number.isFinite(lat) || !Number.isFinite(lng) || Math.abs(lat) > 90 || Math.abs(lng) > 180) {
+        return res.status(400).json({ error: 'lat and lng must be valid coordinates' });
+    }
+    const k = Math.min(Math.max(1, parseInt(req.query.k) || NEAR_DEFAULT_K), NEAR_MAX_K);
+    const geoNear = {
+        near: { type: 'Point', coordinates: [lng, lat] },
+        key: 'location',
+        distanceField: 'distance_km',
+        distanceMultiplier: 0.001,
+        spherical: true,
+    };
+    const radiusKm = parseFloat(req.query.radius_km);
+    if (Number.isFinite(radiusKm) && radiusKm > 0) {
+        geoNear.maxDistance = radiusKm * 1000;
+    }
+    try {
+        // $geoNear walks the 2dsphere index outward from the point, so $limit stops it early
+        res.json(await Dealerships.aggregate([{ $geoNear: geoNear }, { $limit: k }, { $project: PROJECTION }]));
+    } catch (error) {
+        console.log(error);
+        res.status(500).json({ error: 'Error fetching nearby dealerships' });
+    }
+});
+
 // ✅ [MODIFICATION] Implemented endpoint to fetch dealer by ID
 app.get('/fetchDealer/:id', async (req, res) => {
     try {
-        const document = await Dealerships.findOne({ id: parseInt(req.params.id) });
+        const document = await Dealerships.findOne({ id: parseInt(req.params.id) }, PROJECTION).lean();
         if (!document) {
             return res.status(404).json({ error: 'Dealer not found' });
         }
@@ -86,13 +156,66 @@ app.get('/fetchDealer/:id', async (req, res) => {
     }
 });
 
+// Express route to search a dealer's inventory
+// (filters: make, model, body_type, year_min, year_max, max_mileage; always paged by limit/cursor)
+app.get('/fetchCars/:dealer_id', async (req, res) => {
+    try {
+        const filter = carFilter(parseInt(req.params.dealer_id), req.query);
+        await sendPage(Cars, filter, req, res, PROJECTION, { alwaysPage: true });
+    } catch (error) {
+        res.status(500).json({ error: 'Error searching inventory' });
+    }
+});
+
+// Express route for filter-UI counts (per make, model, year, body type and mileage
+// bucket) over a dealer's inventory and the same filters as /fetchCars/:dealer_id
+app.get('/fetchCars/:dealer_id/facets', async (req, res) => {
+    try {
+        res.json(await carFacets(parseInt(req.params.dealer_id), req.query));
+    } catch (error) {
+        res.status(500).json({ error: 'Error computing inventory facets' });
+    }
+});
+
+// Admin routes need "Authorization: Bearer $SEED_TOKEN"; without SEED_TOKEN they are disabled
+function requireSeedToken(req, res, next) {
+    const token = process.env.SEED_TOKEN;
+    if (!token) {
+        return res.status(404).json({ error: 'Not found' });
+    }
+    const given = Buffer.from(req.get('Authorization') || '');
+    const expected = Buffer.from(`Bearer ${token}`);
+    if (given.length !== expected.length || !crypto.timingSafeEqual(given, expected)) {
+        return res.status(401).json({ error: 'Unauthorized' });
+    }
+    next();
+}
+
+// Express route to reseed one dealer's inventory (body: JSON array of cars)
+app.post('/seedCars/:dealer_id', requireSeedToken, express.json({ limit: '5mb' }), async (req, res) => {
+    if (!Array.isArray(req.body)) {
+        return res.status(400).json({ error: 'Expected a JSON array of cars' });
+    }
+    const dealerId = parseInt(req.params.dealer_id);
+    if (isNaN(dealerId)) {
+        return res.status(400).json({ error: 'Invalid dealer id' });
+    }
+    try {
+        const count = await seedDealerInventory(dealerId, req.body);
+        res.json({ seeded: count });
+    } catch (error) {
+        console.log(error);
+        res.status(500).json({ error: 'Error seeding inventory' });
+    }
+});
+
 // Express route to insert review
+// Review ids come from an atomic counter, so inserts stay O(1) and concurrent
+// posts never share an id
 app.post('/insert_review', express.raw({ type: '*/*' }), async (req, res) => {
-    data = JSON.parse(req.body);
-    const documents = await Reviews.find().sort({ id: -1 });
-    let new_id = documents[0]['id'] + 1;
+    const data = JSON.parse(req.body);
 
-    const review = new Reviews({
+    const buildReview = (new_id) => new Reviews({
         "id": new_id,
         "name": data['name'],
         "dealership": data['dealership'],
@@ -102,10 +225,23 @@ app.post('/insert_review', express.raw({ type: '*/*' }), async (req, res) => {
         "car_make": data['car_make'],
         "car_model": data['car_model'],
         "car_year": data['car_year'],
+        "sentiment": data['sentiment'],
     });
 
     try {
-        const savedReview = await review.save();
+        let savedReview;
+        try {
+            savedReview = await buildReview(await Counters.next('reviews')).save();
+        } catch (error) {
+            if (error.code !== 11000) {
+                throw error;
+            }
+            // Counter fell behind the collection (e.g. rows inserted elsewhere): resync once and retry
+            await Counters.syncWith('reviews', Reviews);
+            savedReview = await buildReview(await Counters.next('reviews')).save();
+        }
+        // A failed stats update must not fail the insert; the batch rebuild repairs it
+        await recordReview(savedReview).catch((error) => console.log(error));
         res.json(savedReview);
     } catch (error) {
         console.log(error);
@@ -113,6 +249,39 @@ app.post('/insert_review', express.raw({ type: '*/*' }), async (req, res) => {
     }
 });
 
+// Express route to store precomputed sentiments in bulk
+// Body: JSON array of {"id": <review id>, "sentiment": "positive" | "neutral" | "negative"}
+app.post('/update_sentiments', express.json({ limit: '10mb' }), async (req, res) => {
+    if (!Array.isArray(req.body)) {
+        return res.status(400).json({ error: 'Expected a JSON array of {id, sentiment}' });
+    }
+    // bulkWrite bypasses schema validation, so check every item before writing any
+    const labels = Reviews.schema.path('sentiment').enumValues;
+    const invalid = req.body.find((item) => !item || !Number.isInteger(item.id) || !labels.includes(item.sentiment));
+    if (invalid !== undefined) {
+        return res.status(400).json({ error: `Invalid item ${JSON.stringify(invalid)}: id must be an integer `
+            + `and sentiment one of ${labels.join(', ')}` });
+    }
+    try {
+        const operations = req.body.map((item) => ({
+            updateOne: {
+                filter: { id: item.id },
+                update: { $set: { sentiment: item.sentiment } },
+            },
+        }));
+        const result = operations.length ? await Reviews.bulkWrite(operations, { ordered: false }) : null;
+        // Labels may have changed, so recompute the affected dealers' histograms
+        if (result && result.modifiedCount) {
+            const changed = await Reviews.distinct('dealership', { id: { $in: req.body.map((item) => item.id) } });
+            await rebuildReviewStats(changed);
+        }
+        res.json({ matched: result ? result.matchedCount : 0, modified: result ? result.modifiedCount : 0 });
+    } catch (error) {
+        console.log(error);
+        res.status(500).json({ error: 'Error updating sentiments' });
+    }
+});
+
 // Start the Express server
 app.listen(port, () => {
     console.log(`Server is running on http://localhost:${port}`);
@@ -0,0 +1,54 @@
+const mongoose = require('mongoose');
+
+const Schema = mongoose.Schema;
+
+// One document per sequence, e.g. { _id: 'reviews', seq: 1234 }
+const counters = new Schema({
+  _id: {
+    type: String,
+    required: true
+  },
+  seq: {
+    type: Number,
+    default: 0
+  },
+}, { versionKey: false });
+
+// Atomically reserves and returns the next value of a sequence
+counters.statics.next = async function (name) {
+  const counter = await this.findOneAndUpdate(
+    { _id: name },
+    { $inc: { seq: 1 } },
+    { new: true, upsert: true, lean: true }
+  );
+  return counter.seq;
+};
+
+// Atomically reserves `count` consecutive values; returns the first of them
+counters.statics.reserve = async function (name, count) {
+  const counter = await this.findOneAndUpdate(
+    { _id: name },
+    { $inc: { seq: count } },
+    { new: true, upsert: true, lean: true }
+  );
+  return counter.seq - count + 1;
+};
+
+// Current value of a sequence (0 if it was never used)
+counters.statics.current = async function (name) {
+  const counter = await this.findById(name).lean();
+  return counter ? counter.seq : 0;
+};
+
+// Moves a sequence forward to at least `value` (never backwards)
+counters.statics.atLeast = function (name, value) {
+  return this.updateOne({ _id: name }, { $max: { seq: value } }, { upsert: true });
+};
+
+// Aligns a sequence with the highest `id` stored in a collection (index lookup, not a sort in memory)
+counters.statics.syncWith = async function (name, Model) {
+  const last = await Model.findOne({}, { id: 1 }).sort({ id: -1 }).lean();
+  return this.atLeast(name, last ? last.id : 0);
+};
+
+module.exports = mongoose.model('counters', counters);
@@ -6,6 +6,7 @@ const dealerships = new Schema({
 	id: {
     type: Number,
     required: true,
+    unique: true,
 	},
 	city: {
     type: String,
@@ -37,7 +38,28 @@ const dealerships = new Schema({
   full_name: {
     type: String,
     required: true
+  },
+  // GeoJSON point built from the numeric lat/long, for nearest-dealer queries
+  location: {
+    type: { type: String, enum: ['Point'] },
+    coordinates: { type: [Number], default: undefined }
   }
 });
 
+// /fetchDealers/:state filters on state and pages in id order
+dealerships.index({ state: 1, id: 1 });
+// /fetchDealersNear runs $geoNear on the point
+dealerships.index({ location: '2dsphere' });
+
+// Returns the dealer with `location` filled in from its lat/long strings
+// (unchanged when they are not valid coordinates, so the insert still succeeds)
+dealerships.statics.withLocation = function (dealer) {
+    const lat = parseFloat(dealer.lat);
+    const lng = parseFloat(dealer.long);
+    if (!Number.isFinite(lat) || !Number.isFinite(lng) || Math.abs(lat) > 90 || Math.abs(lng) > 180) {
+        return dealer;
+    }
+    return { ...dealer, location: { type: 'Point', coordinates: [lng, lat] } };
+};
+
 module.exports = mongoose.model('dealerships', dealerships);
@@ -4,6 +4,12 @@ const mongoose = require('mongoose');
 const Schema = mongoose.Schema;
 
 const cars = new Schema({
+// Assigned by the seeder; gives search results a stable order for cursor paging
+id: {
+    type: Number,
+    required: true,
+    unique: true
+},
 dealer_id: {
     type: Number,
     required: true
@@ -27,7 +33,25 @@ year: {
 mileage: {
     type: Number,
     required: true
+  },
+// Cars loaded from a seed file keep (file, position) as their natural key, so
+// reseeding upserts them in place; cars added through /seedCars have neither
+seed_file: {
+    type: String
+  },
+seed_index: {
+    type: Number
   }
 });
 
+// Search indexes follow equality -> sort -> range: every query pins dealer_id,
+// optionally make/model or bodyType, pages by id and may range over year/mileage.
+// make+model and make alone each get their own index: with model between make and
+// id, a make-only filter could not walk the index in id order and sorted in memory
+cars.index({ dealer_id: 1, make: 1, model: 1, id: 1 });
+cars.index({ dealer_id: 1, make: 1, id: 1 });
+cars.index({ dealer_id: 1, bodyType: 1, id: 1 });
+cars.index({ dealer_id: 1, id: 1, year: 1, mileage: 1 });
+cars.index({ seed_file: 1, seed_index: 1 }, { unique: true, partialFilterExpression: { seed_file: { $exists: true } } });
+
 module.exports = mongoose.model('cars', cars);
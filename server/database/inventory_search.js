@@ -0,0 +1,172 @@
+// Inventory search helpers for the /fetchCars routes.
+const Cars = require('./inventory');
+const Counters = require('./counter');
+
+const SEED_BATCH = 10000;
+const MILEAGE_BUCKETS = [0, 10000, 25000, 50000, 75000, 100000, 150000];
+const FACET_CACHE_MAX = 10000;
+
+// dealer_id -> Map(filter key -> facet counts). Every reseed, from this process or
+// a CLI script, bumps the "inventory_version" counter in Mongo; the cache is dropped
+// whenever that version differs from the one it was filled under.
+const facetCache = new Map();
+let facetCacheSize = 0;
+let facetCacheVersion = null;
+
+// Builds the Mongo filter for a dealer's inventory from the request query:
+//   make, model, body_type   exact matches
+//   year_min, year_max       inclusive year range
+//   max_mileage              upper bound on mileage
+function carFilter(dealerId, query) {
+    const filter = { dealer_id: dealerId };
+    if (query.make) {
+        filter.make = String(query.make);
+    }
+    if (query.model) {
+        filter.model = String(query.model);
+    }
+    if (query.body_type) {
+        filter.bodyType = String(query.body_type);
+    }
+    const yearMin = parseInt(query.year_min);
+    const yearMax = parseInt(query.year_max);
+    if (!isNaN(yearMin) || !isNaN(yearMax)) {
+        filter.year = {};
+        if (!isNaN(yearMin)) {
+            filter.year.$gte = yearMin;
+        }
+        if (!isNaN(yearMax)) {
+            filter.year.$lte = yearMax;
+        }
+    }
+    const maxMileage = parseInt(query.max_mileage);
+    if (!isNaN(maxMileage)) {
+        filter.mileage = { $lte: maxMileage };
+    }
+    return filter;
+}
+
+function countsBy(field) {
+    return [
+        { $group: { _id: field, count: { $sum: 1 } } },
+        { $sort: { count: -1, _id: 1 } },
+    ];
+}
+
+// Per-make, per-model, per-year, per-body-type and per-mileage-bucket counts for
+// one filter set, computed in a single $facet aggregation pass
+async function computeFacets(filter) {
+    const [result] = await Cars.aggregate([
+        { $match: filter },
+        {
+            $facet: {
+                total: [{ $count: 'count' }],
+                makes: countsBy('$make'),
+                models: countsBy({ make: '$make', model: '$model' }),
+                years: [{ $group: { _id: '$year', count: { $sum: 1 } } }, { $sort: { _id: -1 } }],
+                bodyTypes: countsBy('$bodyType'),
+                mileage: [{
+                    $bucket: {
+                        groupBy: '$mileage',
+                        boundaries: MILEAGE_BUCKETS,
+                        default: `${MILEAGE_BUCKETS[MILEAGE_BUCKETS.length - 1]}+`,
+                        output: { count: { $sum: 1 } },
+                    },
+                }],
+            },
+        },
+    ]);
+
+    const pairs = (rows, name) => rows.map((row) => ({ [name]: row._id, count: row.count }));
+    return {
+        total: result.total.length ? result.total[0].count : 0,
+        makes: pairs(result.makes, 'make'),
+        models: result.models.map((row) => ({ make: row._id.make, model: row._id.model, count: row.count })),
+        years: pairs(result.years, 'year'),
+        body_types: pairs(result.bodyTypes, 'body_type'),
+        mileage: result.mileage.map((row) => ({
+            min: typeof row._id === 'number' ? row._id : MILEAGE_BUCKETS[MILEAGE_BUCKETS.length - 1],
+            max: typeof row._id === 'number' ? MILEAGE_BUCKETS[MILEAGE_BUCKETS.indexOf(row._id) + 1] : null,
+            count: row.count,
+        })),
+    };
+}
+
+// Cached facet counts for a dealer and filter set
+async function carFacets(dealerId, query) {
+    const version = await Counters.current('inventory_version');
+    if (version !== facetCacheVersion) {
+        invalidateFacets();
+        facetCacheVersion = version;
+    }
+    const filter = carFilter(dealerId, query);
+    const key = JSON.stringify(filter);
+    let dealerFacets = facetCache.get(dealerId);
+    if (dealerFacets && dealerFacets.has(key)) {
+        return dealerFacets.get(key);
+    }
+
+    const facets = await computeFacets(filter);
+    if (facetCacheSize >= FACET_CACHE_MAX) {
+        invalidateFacets();
+    }
+    if (!dealerFacets) {
+        dealerFacets = new Map();
+        facetCache.set(dealerId, dealerFacets);
+    }
+    dealerFacets.set(key, facets);
+    facetCacheSize++;
+    return facets;
+}
+
+// Drops cached facets for one dealer, or for everyone when dealerId is omitted
+function invalidateFacets(dealerId) {
+    if (dealerId === undefined) {
+        facetCache.clear();
+        facetCacheSize = 0;
+        return;
+    }
+    const dealerFacets = facetCache.get(dealerId);
+    if (dealerFacets) {
+        facetCacheSize -= dealerFacets.size;
+        facetCache.delete(dealerId);
+    }
+}
+
+// Marks every process's cached facets as stale
+async function bumpInventoryVersion() {
+    await Counters.next('inventory_version');
+}
+
+// Inserts `records` in unordered batches under ids reserved from the "cars" counter,
+// so concurrent seeders never hand out the same id
+async function insertCars(records, extra = {}) {
+    if (!records.length) {
+        return;
+    }
+    await Counters.syncWith('cars', Cars);
+    let nextId = await Counters.reserve('cars', records.length);
+    for (let start = 0; start < records.length; start += SEED_BATCH) {
+        const batch = records.slice(start, start + SEED_BATCH).map((car) => ({ ...car, ...extra, id: nextId++ }));
+        await Cars.insertMany(batch, { ordered: false, lean: true });
+    }
+}
+
+// Replaces the inventory with `records`; returns the number of cars stored
+async function seedInventory(records) {
+    await Cars.deleteMany({});
+    await insertCars(records);
+    await bumpInventoryVersion();
+    invalidateFacets();
+    return records.length;
+}
+
+// Replaces one dealer's inventory; returns the number of cars stored
+async function seedDealerInventory(dealerId, records) {
+    await Cars.deleteMany({ dealer_id: dealerId });
+    await insertCars(records, { dealer_id: dealerId });
+    await bumpInventoryVersion();
+    return records.length;
+}
+
+module.exports = { carFilter, carFacets, invalidateFacets, bumpInventoryVersion, seedInventory, seedDealerInventory };
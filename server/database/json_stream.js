@@ -0,0 +1,75 @@
+// Streams the items of one array in a large JSON file, e.g. the `reviews` array of
+// { "reviews": [ {...}, {...} ] }, without holding the whole file in memory.
+//
+// A small scanner tracks string/escape state and nesting depth, and each object or
+// array element of the target array is sliced out and handed to JSON.parse.
+// Elements must be objects or arrays, which is what the seed files contain.
+const fs = require('fs');
+
+async function* streamArrayItems(path, key) {
+    let depth = 0;
+    let inString = false;
+    let escape = false;
+    let keyChars = null; // raw characters of a string being read at depth 1
+    let lastKey = null;
+    let arrayDepth = -1; // depth inside the target array, once it is found
+    let parts = null; // pieces of the element being read, across chunk boundaries
+
+    for await (const chunk of fs.createReadStream(path, { encoding: 'utf8' })) {
+        let start = parts !== null ? 0 : -1;
+        for (let i = 0; i < chunk.length; i++) {
+            const ch = chunk[i];
+            if (inString) {
+                if (escape) {
+                    escape = false;
+                } else if (ch === '\\') {
+                    escape = true;
+                } else if (ch === '"') {
+                    inString = false;
+                }
+                if (keyChars !== null) {
+                    if (inString) {
+                        keyChars += ch;
+                    } else {
+                        lastKey = JSON.parse(`"${keyChars}"`);
+                        keyChars = null;
+                    }
+                }
+                continue;
+            }
+            if (ch === '"') {
+                inString = true;
+                if (depth === 1) {
+                    keyChars = '';
+                }
+            } else if (ch === '{' || ch === '[') {
+                if (depth === arrayDepth && parts === null) {
+                    parts = [];
+                    start = i;
+                }
+                depth++;
+                if (ch === '[' && depth === 2 && arrayDepth === -1 && lastKey === key) {
+                    arrayDepth = 2;
+                }
+            } else if (ch === '}' || ch === ']') {
+                depth--;
+                if (depth === arrayDepth && parts !== null) {
+                    parts.push(chunk.slice(start, i + 1));
+                    yield JSON.parse(parts.join(''));
+                    parts = null;
+                    start = -1;
+                } else if (arrayDepth !== -1 && depth < arrayDepth) {
+                    return; // end of the target array; the rest of the file is not read
+                }
+            }
+        }
+        if (parts !== null) {
+            parts.push(chunk.slice(start));
+        }
+    }
+    if (arrayDepth === -1) {
+        throw new Error(`No "${key}" array in ${path}`);
+    }
+}
+
+module.exports = { streamArrayItems };
@@ -0,0 +1,97 @@
+// Cursor pagination and NDJSON streaming for the listing routes.
+//
+//   (no params)            legacy response: the whole result set as one JSON array
+//   ?limit=N[&cursor=C]    { items: [...], next_cursor: C | null }, ordered by id
+//   ?format=ndjson         one JSON document per line, written as Mongo yields them
+//                          (at most `limit` documents, default 100, max 1000),
+//                          then a final { next_cursor: C | null } line
+//                          (also selected by "Accept: application/x-ndjson")
+//
+// Cursors are opaque base64url tokens holding the last id returned, so each page
+// is an index range scan ({ ..., id: { $gt: last } }) rather than a skip.
+const DEFAULT_LIMIT = 100;
+const MAX_LIMIT = 1000;
+
+function encodeCursor(id) {
+    return Buffer.from(JSON.stringify({ id: id })).toString('base64url');
+}
+
+function decodeCursor(cursor) {
+    try {
+        const id = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8')).id;
+        return typeof id === 'number' ? id : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+function wantsNdjson(req) {
+    return req.query.format === 'ndjson' || (req.get('Accept') || '').includes('application/x-ndjson');
+}
+
+function applyCursor(filter, req) {
+    if (!req.query.cursor) {
+        return filter;
+    }
+    const last = decodeCursor(req.query.cursor);
+    if (last === null) {
+        return null;
+    }
+    return { ...filter, id: { $gt: last } };
+}
+
+async function streamNdjson(query, limit, res) {
+    res.status(200).type('application/x-ndjson');
+    try {
+        let written = 0;
+        let lastId = null;
+        let hasMore = false;
+        // One document past the limit tells us whether to hand out a continuation cursor
+        for await (const document of query.limit(limit + 1).cursor()) {
+            if (written === limit) {
+                hasMore = true;
+                break;
+            }
+            if (!res.write(JSON.stringify(document) + '\n')) {
+                await new Promise((resolve) => res.once('drain', resolve));
+            }
+            written += 1;
+            lastId = document.id;
+        }
+        res.end(JSON.stringify({ next_cursor: hasMore ? encodeCursor(lastId) : null }) + '\n');
+    } catch (error) {
+        // Headers are already sent, so the only way to signal failure is to cut the stream
+        console.log(error);
+        res.destroy(error);
+    }
+}
+
+// Sends `Model.find(filter)` as a legacy array, a cursor page or an NDJSON stream
+// (`options.alwaysPage` disables the legacy array for listings that can be huge)
+async function sendPage(Model, filter, req, res, projection, options = {}) {
+    const paged = options.alwaysPage || req.query.limit !== undefined || req.query.cursor !== undefined;
+    if (!paged && !wantsNdjson(req)) {
+        return res.json(await Model.find(filter, projection).lean());
+    }
+
+    const pageFilter = applyCursor(filter, req);
+    if (pageFilter === null) {
+        return res.status(400).json({ error: 'Invalid cursor' });
+    }
+
+    const limit = Math.min(Math.max(1, parseInt(req.query.limit) || DEFAULT_LIMIT), MAX_LIMIT);
+    const query = Model.find(pageFilter, projection).sort({ id: 1 }).lean();
+    if (wantsNdjson(req)) {
+        // Streams are capped like pages; the trailing line carries the cursor for the next one
+        return streamNdjson(query, limit, res);
+    }
+
+    const items = await query.limit(limit + 1);
+    const hasMore = items.length > limit;
+    if (hasMore) {
+        items.pop();
+    }
+    res.json({ items: items, next_cursor: hasMore ? encodeCursor(items[items.length - 1].id) : null });
+}
+
+module.exports = { sendPage, encodeCursor, decodeCursor };
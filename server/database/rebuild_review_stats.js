@@ -0,0 +1,21 @@
+// Batch job: recomputes every dealer's review aggregates from the reviews collection.
+//
+// Usage: node rebuild_review_stats.js [dealer_id ...]
+//   MONGO_URL    Mongo connection string (default mongodb://mongo_db:27017/)
+const mongoose = require('mongoose');
+
+const { rebuildReviewStats } = require('./review_stats');
+
+async function main() {
+  const dealerIds = process.argv.slice(2).map((id) => parseInt(id));
+  await mongoose.connect(process.env.MONGO_URL || 'mongodb://mongo_db:27017/', { dbName: 'dealershipsDB' });
+  const started = Date.now();
+  const dealers = await rebuildReviewStats(dealerIds.length ? dealerIds : undefined);
+  console.log(`Rebuilt review stats for ${dealers} dealers in ${Date.now() - started} ms`);
+  await mongoose.disconnect();
+}
+
+main().catch((error) => {
+  console.log(error);
+  process.exit(1);
+});
@@ -6,6 +6,7 @@ const reviews = new Schema({
 	id: {
     type: Number,
     required: true,
+    unique: true,
 	},
 	name: {
     type: String,
@@ -39,6 +40,20 @@ const reviews = new Schema({
     type: Number,
     required: true
   },
+  // Scored once at insert time (or by the backfill command); missing on legacy rows
+  sentiment: {
+    type: String,
+    enum: ['positive', 'neutral', 'negative'],
+  },
+  created_at: {
+    type: Date,
+    default: Date.now
+  },
 });
 
+// /fetchReviews/dealer/:id filters on dealership and pages in id order
+reviews.index({ dealership: 1, id: 1 });
+// /searchReviews keyword search (Mongo updates the text index on every insert)
+reviews.index({ review: 'text' }, { name: 'review_text', default_language: 'english' });
+
 module.exports = mongoose.model('reviews', reviews);
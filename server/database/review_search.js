@@ -0,0 +1,113 @@
+// Keyword search over review text for the /searchReviews route.
+//
+// Backed by the Mongo text index on `review` (see review.js), which Mongo keeps in
+// sync on every insert, so a search reads the posting lists for its terms instead
+// of scanning the collection. Hits are ranked by textScore, then id, and paged
+// with an opaque cursor holding the last (score, id) returned.
+const Reviews = require('./review');
+
+const DEFAULT_LIMIT = 20;
+const MAX_LIMIT = 100;
+const SNIPPET_RADIUS = 80;
+const SENTIMENTS = ['positive', 'neutral', 'negative'];
+
+// Builds the match stage from the request query:
+//   q                          search terms (Mongo text syntax: "phrases", -excluded)
+//   dealer, year               exact numeric matches
+//   make, model, sentiment     exact matches
+function searchFilter(query) {
+    const filter = { $text: { $search: String(query.q) } };
+    const dealer = parseInt(query.dealer);
+    if (!isNaN(dealer)) {
+        filter.dealership = dealer;
+    }
+    const year = parseInt(query.year);
+    if (!isNaN(year)) {
+        filter.car_year = year;
+    }
+    if (query.make) {
+        filter.car_make = String(query.make);
+    }
+    if (query.model) {
+        filter.car_model = String(query.model);
+    }
+    if (SENTIMENTS.includes(query.sentiment)) {
+        filter.sentiment = query.sentiment;
+    }
+    return filter;
+}
+
+function encodeCursor(score, id) {
+    return Buffer.from(JSON.stringify({ score: score, id: id })).toString('base64url');
+}
+
+function decodeCursor(cursor) {
+    try {
+        const last = JSON.parse(Buffer.from(cursor, 'base64url').toString('utf8'));
+        return typeof last.score === 'number' && typeof last.id === 'number' ? last : null;
+    } catch (error) {
+        return null;
+    }
+}
+
+function escapeRegExp(text) {
+    return text.replace(/[.*+?^${}()|[\]\\]/g, '\\$&');
+}
+
+// The search words, minus excluded (-word) terms, longest first so the snippet
+// centres on the most specific match
+function searchTerms(q) {
+    const words = String(q).replace(/"/g, ' ').split(/\s+/).filter((word) => word && !word.startsWith('-'));
+    return [...new Set(words.map((word) => word.toLowerCase()))].sort((a, b) => b.length - a.length);
+}
+
+// A window of the review around the first term match (text search stems words,
+// so terms match as word prefixes); the start of the review when none matches
+function snippet(text, terms) {
+    let at = -1;
+    let length = 0;
+    for (const term of terms) {
+        const match = new RegExp(`\\b${escapeRegExp(term.slice(0, Math.max(3, term.length - 2)))}\\w*`, 'i').exec(text);
+        if (match && (at === -1 || match.index < at)) {
+            at = match.index;
+            length = match[0].length;
+        }
+    }
+    if (at === -1) {
+        at = 0;
+    }
+    const start = Math.max(0, at - SNIPPET_RADIUS);
+    const end = Math.min(text.length, at + length + SNIPPET_RADIUS);
+    return (start > 0 ? '…' : '') + text.slice(start, end) + (end < text.length ? '…' : '');
+}
+
+// Returns { items: [...hits with score and snippet], next_cursor }, or null for a bad cursor
+async function searchReviews(query, projection) {
+    const pipeline = [
+        { $match: searchFilter(query) },
+        { $addFields: { score: { $meta: 'textScore' } } },
+    ];
+    if (query.cursor) {
+        const last = decodeCursor(query.cursor);
+        if (last === null) {
+            return null;
+        }
+        pipeline.push({ $match: { $or: [{ score: { $lt: last.score } }, { score: last.score, id: { $gt: last.id } }] } });
+    }
+    const limit = Math.min(Math.max(1, parseInt(query.limit) || DEFAULT_LIMIT), MAX_LIMIT);
+    pipeline.push({ $sort: { score: -1, id: 1 } }, { $limit: limit + 1 }, { $project: projection });
+
+    const items = await Reviews.aggregate(pipeline);
+    const hasMore = items.length > limit;
+    if (hasMore) {
+        items.pop();
+    }
+    const terms = searchTerms(query.q);
+    for (const item of items) {
+        item.snippet = snippet(item.review, terms);
+    }
+    const last = items[items.length - 1];
+    return { items: items, next_cursor: hasMore ? encodeCursor(last.score, last.id) : null };
+}
+
+module.exports = { searchReviews, searchFilter, snippet };
@@ -0,0 +1,165 @@
+// Per-dealer review aggregates: counts, sentiment histogram, recency and
+// make/model/year breakdowns, kept up to date on every insert so the summary
+// endpoint is a single document read regardless of how many reviews exist.
+const mongoose = require('mongoose');
+
+const Reviews = require('./review');
+
+const Schema = mongoose.Schema;
+
+const reviewStats = new Schema({
+  dealership: {
+    type: Number,
+    required: true,
+    unique: true
+  },
+  count: {
+    type: Number,
+    default: 0
+  },
+  // positive / neutral / negative, plus "unscored" for legacy rows without a sentiment
+  sentiments: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+  last_review_at: {
+    type: Date
+  },
+  makes: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+  // keyed "make/model"
+  models: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+  years: {
+    type: Map,
+    of: Number,
+    default: {}
+  },
+}, { versionKey: false });
+
+const ReviewStats = mongoose.model('review_stats', reviewStats);
+
+// Map keys may not contain "." or start with "$"
+function encodeKey(key) {
+  return String(key).replace(/%/g, '%25').replace(/\./g, '%2E').replace(/\$/g, '%24');
+}
+
+function decodeKey(key) {
+  return key.replace(/%2E/g, '.').replace(/%24/g, '$').replace(/%25/g, '%');
+}
+
+function decodeMap(map) {
+  const decoded = {};
+  for (const [key, value] of Object.entries(map || {})) {
+    decoded[decodeKey(key)] = value;
+  }
+  return decoded;
+}
+
+// Incrementally folds one newly inserted review into its dealer's aggregates
+function recordReview(review) {
+  return ReviewStats.updateOne(
+    { dealership: review.dealership },
+    {
+      $inc: {
+        count: 1,
+        [`sentiments.${review.sentiment || 'unscored'}`]: 1,
+        [`makes.${encodeKey(review.car_make)}`]: 1,
+        [`models.${encodeKey(`${review.car_make}/${review.car_model}`)}`]: 1,
+        [`years.${encodeKey(review.car_year)}`]: 1,
+      },
+      $max: { last_review_at: review.created_at || new Date() },
+    },
+    { upsert: true }
+  );
+}
+
+function countsByDealer(rows, key) {
+  const byDealer = {};
+  for (const row of rows) {
+    const dealer = row._id.dealership;
+    byDealer[dealer] = byDealer[dealer] || {};
+    byDealer[dealer][encodeKey(key(row._id))] = row.count;
+  }
+  return byDealer;
+}
+
+// Recomputes aggregates from the reviews collection, for the given dealers or for everyone
+async function rebuildReviewStats(dealerIds) {
+  const match = dealerIds ? { dealership: { $in: dealerIds } } : {};
+  // Separate grouped passes (run concurrently) rather than one $facet, whose
+  // single output document would hit the 16MB limit on large collections
+  const group = (id, extra = {}) => Reviews.aggregate([
+    { $match: match },
+    { $group: { _id: id, count: { $sum: 1 }, ...extra } },
+  ]).allowDiskUse(true);
+  const [totals, sentimentRows, makeRows, modelRows, yearRows] = await Promise.all([
+    group({ dealership: '$dealership' }, { last_review_at: { $max: '$created_at' } }),
+    group({ dealership: '$dealership', sentiment: { $ifNull: ['$sentiment', 'unscored'] } }),
+    group({ dealership: '$dealership', make: '$car_make' }),
+    group({ dealership: '$dealership', make: '$car_make', model: '$car_model' }),
+    group({ dealership: '$dealership', year: '$car_year' }),
+  ]);
+  const result = { totals, sentiments: sentimentRows, makes: makeRows, models: modelRows, years: yearRows };
+
+  const sentiments = countsByDealer(result.sentiments, (id) => id.sentiment);
+  const makes = countsByDealer(result.makes, (id) => id.make);
+  const models = countsByDealer(result.models, (id) => `${id.make}/${id.model}`);
+  const years = countsByDealer(result.years, (id) => id.year);
+
+  const operations = result.totals.map((row) => {
+    const dealer = row._id.dealership;
+    return {
+      replaceOne: {
+        filter: { dealership: dealer },
+        replacement: {
+          dealership: dealer,
+          count: row.count,
+          sentiments: sentiments[dealer] || {},
+          last_review_at: row.last_review_at,
+          makes: makes[dealer] || {},
+          models: models[dealer] || {},
+          years: years[dealer] || {},
+        },
+        upsert: true,
+      },
+    };
+  });
+
+  const rebuilt = operations.map((operation) => operation.replaceOne.filter.dealership);
+  const stale = dealerIds ? { dealership: { $in: dealerIds, $nin: rebuilt } } : { dealership: { $nin: rebuilt } };
+  if (operations.length) {
+    await ReviewStats.bulkWrite(operations, { ordered: false });
+  }
+  await ReviewStats.deleteMany(stale);
+  return rebuilt.length;
+}
+
+// Summary for one dealer (zeros when the dealer has no reviews)
+async function getReviewStats(dealerId) {
+  const stats = await ReviewStats.findOne({ dealership: dealerId }, { _id: 0 }).lean();
+  const sentiments = decodeMap(stats && stats.sentiments);
+  return {
+    dealership: dealerId,
+    count: stats ? stats.count : 0,
+    sentiments: {
+      positive: sentiments.positive || 0,
+      neutral: sentiments.neutral || 0,
+      negative: sentiments.negative || 0,
+      unscored: sentiments.unscored || 0,
+    },
+    last_review_at: stats ? stats.last_review_at || null : null,
+    makes: decodeMap(stats && stats.makes),
+    models: decodeMap(stats && stats.models),
+    years: decodeMap(stats && stats.years),
+  };
+}
+
+module.exports = { ReviewStats, recordReview, rebuildReviewStats, getReviewStats };
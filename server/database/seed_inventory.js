@@ -0,0 +1,45 @@
+// Bulk-loads the cars collection.
+//
+// Usage: node seed_inventory.js [count]
+//   Without a count, loads data/car_records.json as-is. With a count, generates
+//   that many synthetic cars (shaped like the sample file) to test search at scale.
+//   MONGO_URL    Mongo connection string (default mongodb://mongo_db:27017/)
+const fs = require('fs');
+const mongoose = require('mongoose');
+
+const Cars = require('./inventory');
+const { seedInventory } = require('./inventory_search');
+
+function syntheticCars(count, sample) {
+    const cars = [];
+    for (let i = 0; i < count; i++) {
+        const base = sample[i % sample.length];
+        cars.push({
+            make: base.make,
+            model: base.model,
+            bodyType: base.bodyType,
+            year: 2000 + (i % 24),
+            dealer_id: 1 + (i % 50),
+            mileage: (i * 7919) % 200000,
+        });
+    }
+    return cars;
+}
+
+async function main() {
+    const sample = JSON.parse(fs.readFileSync('data/car_records.json', 'utf8'))['cars'];
+    const count = process.argv[2] ? parseInt(process.argv[2]) : null;
+    const records = count ? syntheticCars(count, sample) : sample;
+
+    await mongoose.connect(process.env.MONGO_URL || 'mongodb://mongo_db:27017/', { dbName: 'dealershipsDB' });
+    const started = Date.now();
+    await seedInventory(records);
+    await Cars.syncIndexes();
+    console.log(`Seeded ${records.length} cars in ${Date.now() - started} ms`);
+    await mongoose.disconnect();
+}
+
+main().catch((error) => {
+    console.log(error);
+    process.exit(1);
+});
@@ -0,0 +1,30 @@
+const mongoose = require('mongoose');
+
+const Schema = mongoose.Schema;
+
+// One document per seed file, recording the checksum of the last copy applied
+const seedState = new Schema({
+  _id: {
+    type: String,
+    required: true
+  },
+  sha256: {
+    type: String,
+    required: true
+  },
+  count: {
+    type: Number,
+    default: 0
+  },
+  // Bumped when the way rows are keyed changes, so older seeds are re-applied
+  layout: {
+    type: Number,
+    default: 1
+  },
+  seeded_at: {
+    type: Date,
+    default: Date.now
+  },
+}, { versionKey: false, collection: 'seed_state' });
+
+module.exports = mongoose.model('seed_state', seedState);
@@ -0,0 +1,100 @@
+// Seeds large synthetic dealer/review collections and compares collection-scan
+// timings with indexed timings for the hot lookups served by app.js.
+//
+// Usage: node seed_synthetic.js [dealers] [reviews]
+//   MONGO_URL    Mongo connection string (default mongodb://mongo_db:27017/)
+//   BENCH_DB     database to fill (default dealershipsBench, never the live DB)
+const mongoose = require('mongoose');
+
+const Reviews = require('./review');
+const Dealerships = require('./dealership');
+
+const DEALERS = parseInt(process.argv[2] || '5000');
+const REVIEWS = parseInt(process.argv[3] || '1000000');
+const BATCH = 10000;
+const STATES = ['Texas', 'Minnesota', 'California', 'New York', 'Florida', 'Ohio', 'Kansas', 'Oregon'];
+const MAKES = [['Audi', 'A4'], ['Toyota', 'Camry'], ['Kia', 'Seltos'], ['NISSAN', 'Pathfinder'], ['Mercedes', 'C-Class']];
+
+function dealer(id) {
+    return {
+        id: id,
+        city: `City ${id % 500}`,
+        state: STATES[id % STATES.length],
+        address: `${id} Synthetic Street`,
+        zip: String(10000 + (id % 89999)),
+        lat: String(25 + (id % 2400) / 100),
+        long: String(-120 + (id % 5000) / 100),
+        short_name: `Dealer${id}`,
+        full_name: `Dealer ${id} Car Dealership`,
+    };
+}
+
+function review(id) {
+    const [make, model] = MAKES[id % MAKES.length];
+    return {
+        id: id,
+        name: `Reviewer ${id}`,
+        dealership: 1 + (id % DEALERS),
+        review: `Synthetic review number ${id}`,
+        purchase: id % 2 === 0,
+        purchase_date: '07/11/2020',
+        car_make: make,
+        car_model: model,
+        car_year: 2010 + (id % 14),
+    };
+}
+
+async function fill(Model, count, make) {
+    for (let start = 1; start <= count; start += BATCH) {
+        const docs = [];
+        for (let id = start; id < Math.min(start + BATCH, count + 1); id++) {
+            docs.push(make(id));
+        }
+        await Model.collection.insertMany(docs, { ordered: false });
+    }
+}
+
+async function timed(label, query) {
+    const stats = (await query.explain('executionStats')).executionStats;
+    console.log(`${label.padEnd(48)} ${String(stats.executionTimeMillis).padStart(6)} ms  `
+        + `docs examined ${stats.totalDocsExamined}, returned ${stats.nReturned}`);
+}
+
+async function compare(name, Model, filter) {
+    await timed(`${name} (collection scan)`, Model.find(filter).hint({ $natural: 1 }));
+    await timed(`${name} (indexed)`, Model.find(filter));
+}
+
+async function main() {
+    await mongoose.connect(process.env.MONGO_URL || 'mongodb://mongo_db:27017/', {
+        dbName: process.env.BENCH_DB || 'dealershipsBench',
+    });
+
+    console.log(`Seeding ${DEALERS} dealers and ${REVIEWS} reviews...`);
+    await Reviews.deleteMany({});
+    await Dealerships.deleteMany({});
+    let started = Date.now();
+    await fill(Dealerships, DEALERS, (id) => Dealerships.withLocation(dealer(id)));
+    await fill(Reviews, REVIEWS, review);
+    console.log(`Inserted in ${Date.now() - started} ms`);
+
+    started = Date.now();
+    await Reviews.syncIndexes();
+    await Dealerships.syncIndexes();
+    console.log(`Indexes built in ${Date.now() - started} ms`);
+
+    const dealerId = Math.ceil(DEALERS / 2);
+    await compare('/fetchReviews/dealer/:id', Reviews, { dealership: dealerId });
+    await compare('/fetchDealers/:state', Dealerships, { state: 'Ohio' });
+    await compare('/fetchDealer/:id', Dealerships, { id: dealerId });
+    await timed('/fetchDealersNear (2dsphere, k=10)', Dealerships.find({
+        location: { $nearSphere: { $geometry: { type: 'Point', coordinates: [-97.7, 30.3] }, $maxDistance: 200000 } },
+    }).limit(10));
+
+    await mongoose.disconnect();
+}
+
+main().catch((error) => {
+    console.log(error);
+    process.exit(1);
+});
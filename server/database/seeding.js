@@ -0,0 +1,128 @@
+// Incremental, checksum-aware seeding from the bundled JSON files.
+//
+// Each seed file is hashed (streamed, never read whole) and compared with the
+// checksum stored in `seed_state` by the last successful seed. Unchanged files are
+// skipped, so boot costs one hash pass per file. Changed files are streamed (see
+// json_stream.js) and applied as unordered bulk upserts on a natural key: `id` for
+// reviews and dealers, (file, position) for cars. Rows users added (reviews posted
+// through /insert_review, cars from /seedCars, sentiments from the backfill) are
+// never deleted or overwritten.
+//
+// Before layout 2, seed cars were stored untagged as { id: position + 1, ...car }.
+// The first layout-2 seed removes exactly those rows (same id and same fields as
+// the file's car at that position) while it tags the file's cars. Untagged rows
+// left by an older copy of the file no longer match anything in it and, like
+// user-added cars, are kept.
+//
+//   SEED_FORCE=1   apply every file even if its checksum is unchanged
+const crypto = require('crypto');
+const fs = require('fs');
+
+const Reviews = require('./review');
+const Dealerships = require('./dealership');
+const Cars = require('./inventory');
+const Counters = require('./counter');
+const SeedState = require('./seed_state');
+const { streamArrayItems } = require('./json_stream');
+const { rebuildReviewStats } = require('./review_stats');
+const { bumpInventoryVersion, invalidateFacets } = require('./inventory_search');
+
+const SEED_BATCH = 1000;
+// 2: cars keyed on (seed_file, seed_index) with counter-allocated ids
+const SEED_LAYOUT = 2;
+
+function fileChecksum(path) {
+    return new Promise((resolve, reject) => {
+        const hash = crypto.createHash('sha256');
+        fs.createReadStream(path)
+            .on('data', (chunk) => hash.update(chunk))
+            .on('end', () => resolve(hash.digest('hex')))
+            .on('error', reject);
+    });
+}
+
+// Upserts a document by its own `id`
+function upsertById(document) {
+    return { updateOne: { filter: { id: document.id }, update: { $set: document }, upsert: true } };
+}
+
+// Streams `file[key]` and bulk-writes the operations `toOperations(items, firstIndex)`
+// builds for each batch; returns the number of items
+async function applyArray(path, key, Model, toOperations) {
+    let batch = [];
+    let count = 0;
+    const flush = async () => {
+        if (batch.length) {
+            await Model.bulkWrite(await toOperations(batch, count - batch.length), { ordered: false });
+            batch = [];
+        }
+    };
+    for await (const item of streamArrayItems(path, key)) {
+        batch.push(item);
+        count++;
+        if (batch.length >= SEED_BATCH) {
+            await flush();
+        }
+    }
+    await flush();
+    return count;
+}
+
+// Applies one seed file if it changed since the last seed; returns the change or null when skipped
+async function seedFile(path, key, Model, toOperations) {
+    const sha256 = await fileChecksum(path);
+    const previous = await SeedState.findById(path).lean();
+    if (previous && previous.sha256 === sha256 && previous.layout === SEED_LAYOUT && !process.env.SEED_FORCE) {
+        return null;
+    }
+    const started = Date.now();
+    const count = await applyArray(path, key, Model, (items, firstIndex) => toOperations(items, firstIndex, previous));
+    await SeedState.replaceOne({ _id: path },
+        { _id: path, sha256: sha256, count: count, layout: SEED_LAYOUT, seeded_at: new Date() }, { upsert: true });
+    console.log(`Seeded ${count} ${key} from ${path} in ${Date.now() - started} ms`);
+    return { count: count, previous: previous };
+}
+
+// Seed cars have no ids of their own: they are matched on (file, position), and
+// new ones take ids reserved from the "cars" counter, clear of /seedCars ids.
+// Re-keying from an older layout also drops that car's untagged legacy copy.
+async function carOperations(path, cars, firstIndex, previous) {
+    const legacy = !previous || previous.layout !== SEED_LAYOUT;
+    let nextId = await Counters.reserve('cars', cars.length);
+    const operations = [];
+    cars.forEach(({ id, ...car }, offset) => {
+        const index = firstIndex + offset;
+        operations.push({
+            updateOne: {
+                filter: { seed_file: path, seed_index: index },
+                update: { $set: car, $setOnInsert: { id: nextId++ } },
+                upsert: true,
+            },
+        });
+        if (legacy) {
+            operations.push({ deleteOne: { filter: { ...car, seed_file: { $exists: false }, id: index + 1 } } });
+        }
+    });
+    return operations;
+}
+
+async function seedAll(files) {
+    const reviews = await seedFile(files.reviews, 'reviews', Reviews, (items) => items.map(upsertById));
+    if (reviews) {
+        await Promise.all([Counters.syncWith('reviews', Reviews), rebuildReviewStats()]);
+    }
+
+    await seedFile(files.dealerships, 'dealerships', Dealerships,
+        (items) => items.map((dealer) => upsertById(Dealerships.withLocation(dealer))));
+
+    await Counters.syncWith('cars', Cars);
+    const cars = await seedFile(files.cars, 'cars', Cars, (items, firstIndex) => carOperations(files.cars, items, firstIndex));
+    if (cars) {
+        // Positions past the end of the new file were dropped from it
+        await Cars.deleteMany({ seed_file: files.cars, seed_index: { $gte: cars.count } });
+        await bumpInventoryVersion();
+        invalidateFacets();
+    }
+}
+
+module.exports = { seedAll, seedFile, fileChecksum };
@@ -0,0 +1,209 @@
+# ✅ Async counterparts of restapis for the ASGI views
+import asyncio
+import os
+import time
+import weakref
+from urllib.parse import quote
+
+import httpx
+
+from .http_client import HTTP_CONNECT_TIMEOUT, HTTP_POOL_MAXSIZE, HTTP_READ_TIMEOUT, HTTP_RETRIES, http_client
+from .restapis import (
+    SENTIMENT_CALL_TIMEOUT,
+    SENTIMENT_DEADLINE,
+    SENTIMENT_MAX_WORKERS,
+    backend_url,
+    sentiment_analyzer_url,
+)
+
+# ✅ Upper bound on connections kept open by the shared async client
+ASYNC_HTTP_MAX_CONNECTIONS = int(os.getenv('ASYNC_HTTP_MAX_CONNECTIONS', 200))
+
+_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+
+
+async def _stamp_request(request):
+    request.extensions["started_at"] = time.perf_counter()
+
+
+async def _report_response(response):
+    # ✅ Same observers as the sync client, so async calls show up in /metrics and Server-Timing
+    request = response.request
+    started = request.extensions.get("started_at")
+    if started is not None:
+        host = f"{request.url.scheme}://{request.url.netloc.decode('ascii')}"
+        http_client.notify(host, request.method, time.perf_counter() - started, response.status_code >= 500)
+
+
+def get_async_client():
+    """
+    Returns the shared `httpx.AsyncClient` for the running event loop.
+
+    httpx pools are bound to the loop that created them, so one client (and one
+    keep-alive pool) is kept per loop; under uvicorn that is one per worker.
+    """
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=httpx.Timeout(HTTP_READ_TIMEOUT, connect=HTTP_CONNECT_TIMEOUT),
+            limits=httpx.Limits(
+                max_connections=ASYNC_HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=HTTP_POOL_MAXSIZE,
+            ),
+            transport=httpx.AsyncHTTPTransport(retries=HTTP_RETRIES),
+            event_hooks={"request": [_stamp_request], "response": [_report_response]},
+        )
+        _clients[loop] = client
+    return client
+
+
+async def get_request(endpoint, **kwargs):
+    """
+    Async version of `restapis.get_request`.
+
+    Args:
+        endpoint (str): The API endpoint (or absolute URL) to be requested.
+        kwargs: URL parameters to be passed as query strings.
+
+    Returns:
+        JSON response from the backend API, or an {"error": ...} dict.
+    """
+    if "state" in kwargs and kwargs["state"] == "All":
+        del kwargs["state"]
+
+    if endpoint.startswith(("http://", "https://")):
+        request_url = endpoint
+    else:
+        request_url = f"{backend_url}/{endpoint.lstrip('/')}"
+    print(f"🔍 GET from {request_url}")
+
+    try:
+        response = await get_async_client().get(request_url, params=kwargs)
+
+        if response.status_code != 200:
+            print(f"⚠️ Backend returned {response.status_code}: {response.text}")
+            return {"error": f"Backend returned {response.status_code}", "details": response.text}
+
+        return response.json()
+    except ValueError:
+        print(f"❌ Invalid JSON received from backend at {request_url}")
+        return {"error": "Invalid JSON received from backend"}
+    except httpx.HTTPError as err:
+        print(f"❌ Network Exception: {err}")
+        return {"error": f"Request failed: {str(err)}"}
+
+
+async def analyze_review_sentiments(text, timeout=None):
+    """Async version of `restapis.analyze_review_sentiments`."""
+    request_url = f"{sentiment_analyzer_url}/analyze/{quote(text, safe='')}"
+
+    try:
+        response = await get_async_client().get(request_url, timeout=timeout or SENTIMENT_CALL_TIMEOUT)
+
+        if response.status_code != 200:
+            print(f"⚠️ Sentiment Analyzer returned {response.status_code}: {response.text}")
+            return {"error": f"Sentiment Analyzer error {response.status_code}", "details": response.text}
+
+        return response.json()
+    except ValueError:
+        print(f"❌ Invalid JSON from Sentiment Analyzer at {request_url}")
+        return {"sentiment": "neutral", "error": "Invalid JSON response"}
+    except httpx.HTTPError as err:
+        print(f"❌ Network Exception: {err}")
+        return {"sentiment": "neutral", "error": f"Request failed: {str(err)}"}
+
+
+async def analyze_review_sentiments_batch(texts, timeout=None):
+    """
+    Async version of `restapis.analyze_review_sentiments_batch`.
+
+    Returns:
+        List of labels in the same order as `texts`, or None on failure.
+    """
+    if not texts:
+        return []
+
+    request_url = f"{sentiment_analyzer_url}/analyze/batch"
+    print(f"🔍 POST {len(texts)} texts to sentiment analyzer at {request_url}")
+
+    try:
+        response = await get_async_client().post(
+            request_url,
+            json=list(texts),
+            timeout=SENTIMENT_DEADLINE if timeout is None else timeout,
+        )
+
+        if response.status_code != 200:
+            print(f"⚠️ Sentiment Analyzer returned {response.status_code}: {response.text}")
+            return None
+
+        sentiments = response.json().get("sentiments", [])
+        if len(sentiments) != len(texts):
+            print(f"⚠️ Sentiment Analyzer returned {len(sentiments)} labels for {len(texts)} texts")
+            return None
+
+        return [item.get("sentiment", "neutral") for item in sentiments]
+    except (ValueError, AttributeError):
+        print(f"❌ Invalid JSON from Sentiment Analyzer at {request_url}")
+        return None
+    except httpx.HTTPError as err:
+        print(f"❌ Network Exception: {err}")
+        return None
+
+
+async def analyze_review_sentiments_concurrent(texts, call_timeout=None, deadline=None, default="neutral"):
+    """
+    Async version of `restapis.analyze_review_sentiments_concurrent`.
+
+    At most SENTIMENT_MAX_WORKERS calls are in flight at once; calls that fail
+    or are still running at the deadline come back as `default`.
+    """
+    call_timeout = SENTIMENT_CALL_TIMEOUT if call_timeout is None else call_timeout
+    deadline = SENTIMENT_DEADLINE if deadline is None else deadline
+    semaphore = asyncio.Semaphore(SENTIMENT_MAX_WORKERS)
+
+    async def score(text):
+        async with semaphore:
+            return await analyze_review_sentiments(text, call_timeout)
+
+    tasks = [asyncio.ensure_future(score(text)) for text in texts]
+    if not tasks:
+        return []
+    done, not_done = await asyncio.wait(tasks, timeout=deadline)
+
+    for task in not_done:
+        task.cancel()
+    if not_done:
+        print(f"⚠️ Sentiment deadline hit: {len(not_done)} of {len(tasks)} reviews marked neutral")
+
+    labels = []
+    for task in tasks:
+        label = default
+        if task in done and task.exception() is None:
+            result = task.result()
+            if isinstance(result, dict) and "sentiment" in result and "error" not in result:
+                label = result["sentiment"]
+        labels.append(label)
+    return labels
+
+
+async def post_review(data_dict):
+    """Async version of `restapis.post_review`."""
+    request_url = f"{backend_url}/insert_review"
+    print(f"🔍 POST to {request_url}")
+
+    try:
+        response = await get_async_client().post(request_url, json=data_dict)
+
+        if response.status_code != 200:
+            print(f"⚠️ Backend returned {response.status_code}: {response.text}")
+            return {"error": f"Backend error {response.status_code}", "details": response.text}
+
+        return response.json()
+    except ValueError:
+        print(f"❌ Invalid JSON response from backend at {request_url}")
+        return {"status": "failed", "error": "Invalid JSON response"}
+    except httpx.HTTPError as err:
+        print(f"❌ Network Exception: {err}")
+        return {"status": "failed", "error": f"Request failed: {str(err)}"}
@@ -0,0 +1,81 @@
+# ✅ Native async (ASGI) versions of the dealer and review API views
+#
+# Served under an ASGI server (e.g. `uvicorn djangoproj.asgi:application`), each
+# of these awaits its upstream calls on the event loop, so one worker can keep
+# many slow Node backend / sentiment analyzer calls in flight at once.
+import json
+import logging
+
+from asgiref.sync import sync_to_async
+from django.views.decorators.csrf import csrf_exempt
+
+from .async_restapis import get_request, post_review
+from .dealer_cache import dealer_cache
+from .sentiment import aget_sentiments
+from .views import dealer_listing_response, json_response
+
+logger = logging.getLogger(__name__)
+
+
+def _is_authenticated(request):
+    # Resolving request.user touches the session store and the ORM
+    return request.user.is_authenticated
+
+
+async def get_dealerships_async(request, state="All"):
+    """Async `get_dealerships`: same upstream, dealer cache and ETag revalidation."""
+    return dealer_listing_response(request, await dealer_cache.aget(state))
+
+
+async def get_dealer_reviews_async(request, dealer_id):
+    try:
+        reviews = await get_request(f"/fetchReviews/dealer/{dealer_id}")
+
+        if isinstance(reviews, dict) and "error" in reviews:
+            return json_response({"status": 502, "error": reviews["error"]})
+
+        if not reviews:
+            return json_response({"status": 404, "error": "No reviews found for this dealer"})
+
+        legacy = [review for review in reviews if not review.get('sentiment')]
+        if legacy:
+            sentiments = await aget_sentiments([review['review'] for review in legacy])
+            for review, sentiment in zip(legacy, sentiments):
+                review['sentiment'] = sentiment
+
+        return json_response({"status": 200, "reviews": reviews})
+    except Exception as e:
+        logger.error(f"❌ Error fetching dealer reviews: {e}")
+        return json_response({"status": 500, "error": "Failed to retrieve reviews"})
+
+
+@csrf_exempt
+async def add_review_async(request):
+    if request.method != "POST":
+        return json_response({"status": 405, "message": "Method Not Allowed"}, status=405)
+
+    if not await sync_to_async(_is_authenticated)(request):
+        return json_response({"status": 403, "message": "Unauthorized"}, status=403)
+
+    try:
+        data = json.loads(request.body)
+    except json.JSONDecodeError:
+        return json_response({"status": 400, "message": "Invalid JSON format"}, status=400)
+
+    if isinstance(data, dict):
+        data.pop("sentiment", None)  # ✅ Always scored server-side
+        if data.get("review"):
+            sentiment = (await aget_sentiments([data["review"]], default=None))[0]
+            if sentiment:
+                data["sentiment"] = sentiment
+
+    try:
+        response = await post_review(data)
+
+        if not response:
+            return json_response({"status": 500, "message": "Failed to submit review"})
+
+        return json_response({"status": 200, "response": response})
+    except Exception as e:
+        logger.error(f"❌ Error submitting review: {e}")
+        return json_response({"status": 500, "message": "Error submitting review"})
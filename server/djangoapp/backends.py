@@ -0,0 +1,44 @@
+# ✅ Cached user resolution for session-authenticated requests
+import os
+
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+# ✅ Seconds a resolved user stays cached; saves, deletes and logouts drop it sooner
+USER_CACHE_TTL = int(os.getenv('USER_CACHE_TTL', 300))
+USER_CACHE_BACKEND = os.getenv('USER_CACHE_BACKEND', 'default')
+
+
+def user_cache_key(user_id):
+    return f"auth:user:{user_id}"
+
+
+def invalidate_user(user_id):
+    caches[USER_CACHE_BACKEND].delete(user_cache_key(user_id))
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend whose `get_user` (run by AuthenticationMiddleware on every
+    request with a session) is served from the Django cache.
+
+    Together with the cached_db session engine, a steady-state authenticated
+    request resolves its session and user without SQL. Entries are dropped by
+    the user save/delete and logout signals in `djangoapp.signals`. Those
+    deletes only reach other processes through a shared cache, so with a
+    per-process one this behaves exactly like ModelBackend.
+    """
+
+    def get_user(self, user_id):
+        cache = caches[USER_CACHE_BACKEND]
+        if isinstance(cache, (LocMemCache, DummyCache)):
+            return super().get_user(user_id)
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = super().get_user(user_id)  # None for missing or inactive users, which are not cached
+            if user is not None:
+                cache.set(key, user, USER_CACHE_TTL)
+        return user
@@ -0,0 +1,132 @@
+# ✅ Server-side response cache for the dealer listings
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from . import async_restapis
+from .restapis import get_request
+
+logger = logging.getLogger(__name__)
+
+# ✅ Cache tuning (seconds): entries are fresh for TTL, then served stale for up to
+# STALE more seconds while a background refresh fetches the new listing
+DEALER_CACHE_TTL = int(os.getenv('DEALER_CACHE_TTL', 300))
+DEALER_CACHE_STALE = int(os.getenv('DEALER_CACHE_STALE', 3600))
+DEALER_CACHE_BACKEND = os.getenv('DEALER_CACHE_BACKEND', 'default')
+
+GENERATION_KEY = "dealers:generation"
+REFRESH_LOCK_TIMEOUT = 30
+
+
+def _endpoint(state):
+    return "/fetchDealers" if state == "All" else f"/fetchDealers/{state}"
+
+
+class DealerListCache:
+    """
+    Caches the serialized `/api/get_dealers/` payload per state ("All" included).
+
+    Each entry holds the response body bytes, its ETag and Last-Modified time,
+    so hits cost one cache read and no JSON encoding. Keys carry a generation
+    number, letting `invalidate()` drop every state at once.
+
+    `invalidate()` only reaches every worker when the cache is shared (e.g.
+    Redis). With a per-process cache each worker's listings are at most `ttl`
+    seconds stale (one more request once expired, while the refresh runs), and
+    there is nothing to invalidate centrally.
+    """
+
+    def __init__(self, ttl=DEALER_CACHE_TTL, stale=DEALER_CACHE_STALE, backend=DEALER_CACHE_BACKEND):
+        self.ttl = ttl
+        self.stale = stale
+        self.backend = backend
+
+    @property
+    def cache(self):
+        return caches[self.backend]
+
+    @property
+    def shared(self):
+        """True when the cache alias is visible to every process (not per-process memory)."""
+        return not isinstance(self.cache, (LocMemCache, DummyCache))
+
+    def _key(self, state):
+        generation = self.cache.get_or_set(GENERATION_KEY, time.time_ns, timeout=None)
+        return f"dealers:{generation}:{state}"
+
+    def _fetch(self, state, previous=None):
+        """Fetches the listing upstream and stores it; returns the new entry or None."""
+        return self._store(state, get_request(_endpoint(state)), previous)
+
+    def _store(self, state, dealers, previous=None):
+        if not isinstance(dealers, list):
+            logger.error(f"❌ Dealer refresh for '{state}' failed: {dealers}")
+            return None
+
+        body = json.dumps({"status": 200, "dealers": dealers}).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        now = time.time()
+        # ✅ Keep Last-Modified stable when the refreshed listing is unchanged
+        last_modified = previous["last_modified"] if previous and previous["etag"] == etag else int(now)
+        entry = {"body": body, "etag": etag, "last_modified": last_modified, "fetched_at": now}
+        self.cache.set(self._key(state), entry, timeout=self.ttl + self.stale)
+        return entry
+
+    def _refresh_in_background(self, state, previous):
+        lock_key = f"dealers:refreshing:{state}"
+        if not self.cache.add(lock_key, 1, timeout=REFRESH_LOCK_TIMEOUT):
+            return  # ✅ Another request (or worker) is already revalidating
+
+        def refresh():
+            try:
+                self._fetch(state, previous)
+            finally:
+                self.cache.delete(lock_key)
+
+        threading.Thread(target=refresh, name=f"dealers-refresh-{state}", daemon=True).start()
+
+    def _cached(self, state):
+        """Returns the cached entry (or None), starting a background refresh if it is stale."""
+        entry = self.cache.get(self._key(state))
+        if entry is not None and time.time() - entry["fetched_at"] > self.ttl:
+            self._refresh_in_background(state, entry)
+        return entry
+
+    def get(self, state="All"):
+        """
+        Returns the cached entry for `state`, fetching it on a miss.
+
+        Stale entries are returned immediately while a refresh runs in the
+        background. Returns None only if nothing is cached and the upstream
+        fetch fails.
+        """
+        entry = self._cached(state)
+        if entry is None:
+            return self._fetch(state)
+        return entry
+
+    async def aget(self, state="All"):
+        """Async `get` for the ASGI views: a miss awaits the upstream fetch on the event loop."""
+        entry = await sync_to_async(self._cached)(state)
+        if entry is None:
+            dealers = await async_restapis.get_request(_endpoint(state))
+            entry = await sync_to_async(self._store)(state, dealers)
+        return entry
+
+    def invalidate(self, state=None):
+        """Drops one state's listing (plus "All"), or every listing when `state` is None."""
+        if state is None or state == "All":
+            self.cache.set(GENERATION_KEY, time.time_ns(), timeout=None)
+            return
+        self.cache.delete_many([self._key(state), self._key("All")])
+
+
+dealer_cache = DealerListCache()
@@ -0,0 +1,123 @@
+# ✅ Shared, pooled HTTP client for every outbound call from the Django tier
+import os
+import time
+from threading import Lock
+from urllib.parse import urlsplit
+
+import requests
+from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+load_dotenv()
+
+# ✅ Client tuning (timeouts in seconds)
+HTTP_CONNECT_TIMEOUT = float(os.getenv('HTTP_CONNECT_TIMEOUT', 3.0))
+HTTP_READ_TIMEOUT = float(os.getenv('HTTP_READ_TIMEOUT', 10.0))
+HTTP_POOL_MAXSIZE = int(os.getenv('HTTP_POOL_MAXSIZE', 32))
+HTTP_RETRIES = int(os.getenv('HTTP_RETRIES', 2))
+HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', 0.2))
+
+
+class HttpClient:
+    """
+    One keep-alive `requests.Session` per backend host, shared by all threads.
+
+    Each session mounts an adapter with its own connection pool, so calls to
+    the Express backend and the sentiment analyzer reuse open connections
+    instead of paying a TCP/TLS handshake (and an ephemeral port) every time.
+    Idempotent GETs are retried with exponential backoff on connection errors and
+    502/503/504; POSTs never are. Read timeouts are never retried, so a call's
+    `timeout` is a real upper bound on how long it waits for the upstream.
+    """
+
+    def __init__(self, connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT,
+                 pool_maxsize=HTTP_POOL_MAXSIZE, retries=HTTP_RETRIES, backoff=HTTP_RETRY_BACKOFF):
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_maxsize = pool_maxsize
+        self.retries = retries
+        self.backoff = backoff
+        self._sessions = {}  # "scheme://host:port" -> (Session, HTTPAdapter)
+        self._counters = {}  # "scheme://host:port" -> {"requests", "errors", "in_flight"}
+        self._observers = []  # callables(host, method, seconds, error) run after every request
+        self._lock = Lock()
+
+    def add_observer(self, observer):
+        """Registers `observer(host, method, seconds, error)`, called after every request."""
+        self._observers.append(observer)
+
+    def notify(self, host, method, seconds, error):
+        """Reports a finished request to the observers (also used by the async client)."""
+        for observer in self._observers:
+            observer(host, method, seconds, error)
+
+    def _session(self, url):
+        parts = urlsplit(url)
+        host = f"{parts.scheme}://{parts.netloc}"
+        entry = self._sessions.get(host)
+        if entry is None:
+            with self._lock:
+                entry = self._sessions.get(host)
+                if entry is None:
+                    retry = Retry(
+                        total=self.retries,
+                        read=0,  # ✅ A read timeout means the upstream is slow; retrying multiplies the wait
+                        backoff_factor=self.backoff,
+                        status_forcelist=(502, 503, 504),
+                        allowed_methods=frozenset(["GET", "HEAD"]),
+                        raise_on_status=False,
+                    )
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize, max_retries=retry)
+                    session = requests.Session()
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    entry = (session, adapter)
+                    self._sessions[host] = entry
+                    self._counters[host] = {"requests": 0, "errors": 0, "in_flight": 0}
+        return host, entry[0]
+
+    def _count(self, host, key, delta=1):
+        with self._lock:
+            self._counters[host][key] += delta
+
+    def request(self, method, url, **kwargs):
+        """Sends a request through the pooled session for `url`'s host."""
+        kwargs.setdefault("timeout", self.timeout)
+        host, session = self._session(url)
+        with self._lock:
+            counters = self._counters[host]
+            counters["requests"] += 1
+            counters["in_flight"] += 1
+        started = time.perf_counter()
+        error = True
+        try:
+            response = session.request(method, url, **kwargs)
+            error = response.status_code >= 500
+            return response
+        except requests.exceptions.RequestException:
+            self._count(host, "errors")
+            raise
+        finally:
+            self._count(host, "in_flight", -1)
+            self.notify(host, method, time.perf_counter() - started, error)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url, **kwargs):
+        return self.request("POST", url, **kwargs)
+
+    def stats(self):
+        """Per-host request counters plus connection-pool usage."""
+        with self._lock:
+            hosts = {host: dict(counters) for host, counters in self._counters.items()}
+            adapters = {host: entry[1] for host, entry in self._sessions.items()}
+        for host, adapter in adapters.items():
+            pools = [adapter.poolmanager.pools[key] for key in adapter.poolmanager.pools.keys()]
+            hosts[host]["connections_opened"] = sum(pool.num_connections for pool in pools)
+            hosts[host]["pool_requests"] = sum(pool.num_requests for pool in pools)
+            hosts[host]["pool_maxsize"] = self.pool_maxsize
+        return hosts
+
+
+http_client = HttpClient()
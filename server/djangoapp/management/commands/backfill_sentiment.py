@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp.restapis import (
+    analyze_review_sentiments_batch,
+    backend_url,
+    get_request,
+    update_review_sentiments,
+)
+
+
+class Command(BaseCommand):
+    help = "Scores stored reviews that have no sentiment yet and saves the labels with them."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=200,
+                            help="Reviews scored per analyzer call and written per bulk update.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        if batch_size < 1:
+            raise CommandError("--batch-size must be at least 1")
+
+        reviews = get_request(f"{backend_url}/fetchReviews", missing_sentiment=1)
+        if not isinstance(reviews, list):
+            raise CommandError(f"Could not fetch reviews: {reviews}")
+
+        self.stdout.write(f"🔍 {len(reviews)} reviews without a stored sentiment")
+        updated = 0
+        for start in range(0, len(reviews), batch_size):
+            chunk = reviews[start:start + batch_size]
+            labels = analyze_review_sentiments_batch([review["review"] for review in chunk])
+            if labels is None:
+                raise CommandError(f"Sentiment analyzer failed after {updated} reviews; re-run to resume")
+
+            result = update_review_sentiments(
+                [{"id": review["id"], "sentiment": label} for review, label in zip(chunk, labels)]
+            )
+            if "error" in result:
+                raise CommandError(f"Backend rejected update after {updated} reviews: {result}")
+            updated += len(chunk)
+            self.stdout.write(f"✅ {updated}/{len(reviews)} reviews scored")
+
+        self.stdout.write(self.style.SUCCESS(f"Backfilled sentiment for {updated} reviews"))
@@ -0,0 +1,33 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from djangoapp.populate import CAR_MAKE_DATA, CAR_MODEL_DATA, bulk_seed, load_catalog
+
+
+class Command(BaseCommand):
+    help = "Idempotently bulk-loads car makes and models (run at deploy time)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--file", help="JSON or CSV catalog to load instead of the built-in sample.")
+
+    def handle(self, *args, **options):
+        if options["file"]:
+            try:
+                makes, models = load_catalog(options["file"])
+            except (OSError, ValueError, KeyError) as e:
+                raise CommandError(f"Could not read catalog {options['file']}: {e}")
+        else:
+            makes, models = CAR_MAKE_DATA, CAR_MODEL_DATA
+
+        started = time.perf_counter()
+        try:
+            makes_created, models_created = bulk_seed(makes, models)
+        except KeyError as e:
+            raise CommandError(f"Catalog row is missing {e}")
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {makes_created} new makes and {models_created} new models "
+            f"({len(models)} rows read) in {elapsed:.2f}s"
+        ))
@@ -0,0 +1,188 @@
+# ✅ In-process request metrics: latency histograms, Prometheus text and Server-Timing
+import contextvars
+import time
+from bisect import bisect_left
+from threading import Lock
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.db import connection
+from django.http import HttpResponse
+
+from .http_client import http_client
+
+# ✅ Histogram bucket upper bounds in seconds (Prometheus client defaults)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0)
+
+
+class Histogram:
+    """
+    A labelled latency histogram with fixed buckets.
+
+    `observe` is a bisect plus a few increments under one lock, so recording
+    costs around a microsecond. Each label set also counts its errors, which
+    gives error rates without a separate counter family.
+    """
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum, errors]
+        self._lock = Lock()
+
+    def observe(self, labels, seconds, error=False):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += seconds
+            series[-1] += error
+
+    def render(self):
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        lines = [f"# HELP {self.name}_seconds {self.help_text}", f"# TYPE {self.name}_seconds histogram"]
+        errors = []
+        for labels, series in sorted(snapshot.items()):
+            label_text = ",".join(f'{key}="{_escape(value)}"' for key, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f'{self.name}_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_seconds_sum{{{label_text}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_seconds_count{{{label_text}}} {cumulative}")
+            errors.append(f"{self.name}_errors_total{{{label_text}}} {series[-1]}")
+        lines.append(f"# TYPE {self.name}_errors_total counter")
+        return "\n".join(lines + errors)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+view_latency = Histogram("django_view", "Time spent handling requests, by view, method and status.",
+                         ("view", "method", "status"))
+upstream_latency = Histogram("django_upstream", "Outbound HTTP call latency, by upstream host and method.",
+                             ("host", "method"))
+
+# ✅ Per-request timing accumulator: {"upstream": [seconds, calls], "db": [seconds, queries]}.
+# Pool threads running in a copy of the request's context update the same dict, hence the lock.
+_timings = contextvars.ContextVar("request_timings", default=None)
+_timings_lock = Lock()
+
+
+def record_upstream(host, method, seconds, error=False):
+    """HTTP client observer: runs after every outbound request."""
+    upstream_latency.observe((host, method), seconds, error)
+    _add_timing("upstream", seconds)
+
+
+http_client.add_observer(record_upstream)
+
+
+def _add_timing(name, seconds):
+    timings = _timings.get()
+    if timings is not None:
+        with _timings_lock:
+            entry = timings.get(name)
+            if entry is None:
+                timings[name] = [seconds, 1]
+            else:
+                entry[0] += seconds
+                entry[1] += 1
+
+
+def _time_query(execute, sql, params, many, context):
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        _add_timing("db", time.perf_counter() - started)
+
+
+class MetricsMiddleware:
+    """
+    Times every request (put it first in MIDDLEWARE so sessions and auth are
+    included), records it in `view_latency` and adds a Server-Timing header with
+    the total plus the time spent in upstream calls and SQL queries.
+
+    Runs natively in both modes, so ASGI requests to the async views are never
+    pushed onto a thread by this middleware. SQL time is only broken out for
+    sync requests: async views run their queries on other threads' connections.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        token = _timings.set({})
+        started = time.perf_counter()
+        try:
+            with connection.execute_wrapper(_time_query):
+                response = self.get_response(request)
+        except Exception:
+            _observe_failure(request, started)
+            raise
+        finally:
+            timings = _timings.get()
+            _timings.reset(token)
+        return _finish(request, response, started, timings)
+
+    async def __acall__(self, request):
+        token = _timings.set({})
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        except Exception:
+            _observe_failure(request, started)
+            raise
+        finally:
+            timings = _timings.get()
+            _timings.reset(token)
+        return _finish(request, response, started, timings)
+
+
+def _observe_failure(request, started):
+    view_latency.observe((_view_name(request), request.method, "500"), time.perf_counter() - started, True)
+
+
+def _finish(request, response, started, timings):
+    elapsed = time.perf_counter() - started
+    view_latency.observe((_view_name(request), request.method, str(response.status_code)), elapsed,
+                         response.status_code >= 500)
+    parts = [f"app;dur={elapsed * 1000:.2f}"]
+    for name, (seconds, calls) in timings.items():
+        parts.append(f'{name};dur={seconds * 1000:.2f};desc="{calls} calls"')
+    response["Server-Timing"] = ", ".join(parts)
+    return response
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unmatched"
+    return match.url_name or match.view_name or "unnamed"
+
+
+def metrics_view(request):
+    """Prometheus text exposition of this process's request and upstream metrics."""
+    lines = [view_latency.render(), upstream_latency.render(),
+             "# TYPE django_upstream_connections_opened gauge"]
+    pools = http_client.stats()
+    for host, counters in sorted(pools.items()):
+        lines.append(f'django_upstream_connections_opened{{host="{_escape(host)}"}} {counters["connections_opened"]}')
+    lines.append("# TYPE django_upstream_in_flight gauge")
+    for host, counters in sorted(pools.items()):
+        lines.append(f'django_upstream_in_flight{{host="{_escape(host)}"}} {counters["in_flight"]}')
+    return HttpResponse("\n".join(lines) + "\n", content_type="text/plain; version=0.0.4; charset=utf-8")
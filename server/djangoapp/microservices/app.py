@@ -1,35 +1,113 @@
-from flask import Flask
-from nltk.sentiment import SentimentIntensityAnalyzer
+from flask import Flask, Response, request, jsonify
+from logs import log_event
+import metrics
+from scoring import PolarityMemo, label_scores, load_analyzer
 import json
+import os
+import time
 app = Flask("Sentiment Analyzer")
+metrics.init_app(app)
 
-sia = SentimentIntensityAnalyzer()
+started = time.perf_counter()
+sia = load_analyzer()
+log_event("analyzer_loaded", sampled=False, pid=os.getpid(),
+          seconds=round(time.perf_counter() - started, 3))
+
+# Upper bound on texts accepted by one /analyze/batch request
+MAX_BATCH_SIZE = int(os.getenv("MAX_BATCH_SIZE", 1000))
+# Distinct texts whose scores are memoized per worker (0 disables the memo)
+POLARITY_CACHE_SIZE = int(os.getenv("POLARITY_CACHE_SIZE", 50000))
+
+memo = PolarityMemo(sia, POLARITY_CACHE_SIZE)
 
 
 @app.get('/')
 def home():
     return "Welcome to the Sentiment Analyzer. \
-    Use /analyze/text to get the sentiment"
+    Use /analyze/text to get the sentiment \
+    or POST a JSON array of texts to /analyze/batch"
+
+
+@app.get('/healthz')
+def healthz():
+    """Liveness: the worker process is up and serving requests."""
+    return jsonify({"status": "ok"})
+
+
+@app.get('/readyz')
+def readyz():
+    """Readiness: the analyzer and its lexicon are loaded and can score text."""
+    try:
+        sia.polarity_scores("ready")
+    except Exception as e:
+        log_event("not_ready", sampled=False, error=str(e))
+        return jsonify({"status": "unavailable"}), 503
+    return jsonify({"status": "ready", "lexicon_size": len(sia.lexicon)})
+
+
+@app.get('/stats')
+def stats():
+    """Polarity memo counters for this worker process."""
+    return jsonify({"pid": os.getpid(), "polarity_cache": memo.stats()})
+
+
+@app.get('/metrics')
+def prometheus_metrics():
+    """Prometheus text: per-route latency histograms and polarity memo counters for this worker."""
+    cache = memo.stats()
+    body = metrics.render(
+        gauges={"analyzer_polarity_cache_size": cache["size"]},
+        counters={
+            "analyzer_polarity_cache_hits_total": cache["hits"],
+            "analyzer_polarity_cache_misses_total": cache["misses"],
+            "analyzer_polarity_cache_evictions_total": cache["evictions"],
+        },
+    )
+    return Response(body, mimetype="text/plain; version=0.0.4")
 
 
 @app.get('/analyze/<input_txt>')
 def analyze_sentiment(input_txt):
 
-    scores = sia.polarity_scores(input_txt)
-    print(scores)
-    pos = float(scores['pos'])
-    neg = float(scores['neg'])
-    neu = float(scores['neu'])
-    res = "positive"
-    print("pos neg nue ", pos, neg, neu)
-    if (neg > pos and neg > neu):
-        res = "negative"
-    elif (neu > neg and neu > pos):
-        res = "neutral"
-    res = json.dumps({"sentiment": res})
-    print(res)
+    scores = memo.polarity_scores(input_txt)
+    label = label_scores(scores)
+    log_event("analyze", pos=scores['pos'], neg=scores['neg'], neu=scores['neu'], sentiment=label)
+    res = json.dumps({"sentiment": label})
     return res
 
 
+@app.post('/analyze/batch')
+def analyze_batch():
+    """
+    Scores many texts in one request.
+
+    Accepts a JSON array of strings or of {"id", "text"} objects (optionally
+    wrapped as {"reviews": [...]}) and returns the labels in the same order.
+    """
+    payload = request.get_json(silent=True)
+    if isinstance(payload, dict):
+        payload = payload.get("reviews")
+    if not isinstance(payload, list):
+        return jsonify({"error": "Expected a JSON array of texts"}), 400
+    if len(payload) > MAX_BATCH_SIZE:
+        return jsonify({"error": f"Batch larger than {MAX_BATCH_SIZE}"}), 413
+
+    results = []
+    for item in payload:
+        if isinstance(item, dict):
+            text = item.get("text")
+            result = {"id": item.get("id")}
+        else:
+            text = item
+            result = {}
+        if not isinstance(text, str):
+            return jsonify({"error": "Every item needs a text string"}), 400
+        result["sentiment"] = label_scores(memo.polarity_scores(text))
+        results.append(result)
+
+    log_event("analyze_batch", size=len(results))
+    return jsonify({"sentiments": results})
+
+
 if __name__ == "__main__":
     app.run(debug=True)
@@ -0,0 +1,54 @@
+"""
+Compiles sentiment/vader_lexicon.zip into a pickled dict that the analyzer
+loads at startup instead of locating and parsing the zipped text lexicon.
+
+    python build_lexicon.py [--check]
+
+--check also reports how long each way of building the analyzer takes.
+"""
+import os
+import pickle
+import sys
+import time
+
+from scoring import COMPILED_LEXICON, LEXICON_ZIP, analyzer_from_lexicon, parse_lexicon_zip
+
+
+def build():
+    lexicon = parse_lexicon_zip(LEXICON_ZIP)
+    tmp = COMPILED_LEXICON + ".tmp"
+    with open(tmp, "wb") as handle:
+        pickle.dump(lexicon, handle, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp, COMPILED_LEXICON)
+    print(f"wrote {len(lexicon)} entries to {COMPILED_LEXICON}")
+    return lexicon
+
+
+def timed(label, load, repeat=20):
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        sia = load()
+        best = min(best, time.perf_counter() - started)
+    assert sia.polarity_scores("Great service!")["compound"] > 0
+    print(f"{label:<34} {best * 1000:8.2f} ms")
+
+
+def check():
+    def from_pickle():
+        with open(COMPILED_LEXICON, "rb") as handle:
+            return analyzer_from_lexicon(pickle.load(handle))
+
+    timed("zip (parse text lexicon)", lambda: analyzer_from_lexicon(parse_lexicon_zip(LEXICON_ZIP)))
+    timed("compiled (unpickle dict)", from_pickle)
+    try:
+        from nltk.sentiment import SentimentIntensityAnalyzer
+        timed("nltk SentimentIntensityAnalyzer()", SentimentIntensityAnalyzer)
+    except LookupError:
+        print("nltk SentimentIntensityAnalyzer()   lexicon not on the NLTK data path")
+
+
+if __name__ == "__main__":
+    build()
+    if "--check" in sys.argv:
+        check()
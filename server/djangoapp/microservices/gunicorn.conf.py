@@ -0,0 +1,40 @@
+# Production serving for the analyzer: `gunicorn -c gunicorn.conf.py app:app`
+#
+#   WORKERS   preforked worker processes (default: one per core)
+#   THREADS   threads per worker (default 2)
+#   PORT      listen port (default 5000, same as `flask run`)
+#
+# Each worker imports app.py once at boot, building SentimentIntensityAnalyzer
+# and loading the lexicon before it accepts traffic. With PRELOAD (the default)
+# that happens once in the master instead, and the forked workers share the
+# lexicon's memory pages copy-on-write.
+import gc
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+workers = int(os.getenv("WORKERS", multiprocessing.cpu_count()))
+threads = int(os.getenv("THREADS", 2))
+worker_class = "gthread" if threads > 1 else "sync"
+timeout = int(os.getenv("WORKER_TIMEOUT", 30))
+keepalive = int(os.getenv("KEEPALIVE", 5))
+# Recycle workers now and then so a slow leak can never take the service down
+max_requests = int(os.getenv("MAX_REQUESTS", 100000))
+max_requests_jitter = max_requests // 10
+accesslog = os.getenv("ACCESS_LOG") or None
+errorlog = "-"
+preload_app = os.getenv("PRELOAD", "true").lower() == "true"
+
+
+def when_ready(server):
+    # Move everything loaded so far (the lexicon included) out of the GC's view,
+    # so collections in the workers don't write to, and so copy, shared pages
+    if preload_app:
+        gc.freeze()
+
+
+def post_fork(server, worker):
+    # The log listener thread started in the master (preload) is not copied into
+    # the fork; give each worker its own before it serves requests
+    import logs
+    logs.start_listener()
@@ -0,0 +1,114 @@
+"""
+Load test for the analyzer.
+
+Drives GET /analyze/<text> from several client processes over keep-alive
+connections and reports requests per second.
+
+    # against a running service
+    python loadtest.py --url http://127.0.0.1:5000 --clients 16 --duration 10
+
+    # start gunicorn locally with 1, 2, 4 and 8 workers and compare throughput
+    python loadtest.py --sweep 1,2,4,8
+"""
+import argparse
+import http.client
+import json
+import os
+import subprocess
+import sys
+import time
+import urllib.request
+from multiprocessing import Pool
+from urllib.parse import quote, urlsplit
+
+TEXTS = [
+    "Great service!",
+    "The salesman was rude and the car broke down a week later",
+    "Fantastic services",
+    "Expanded global groupware",
+    "I would not recommend this dealership to anyone",
+    "Smooth purchase, friendly staff and a fair price",
+]
+
+
+def _client(args):
+    url, duration = args
+    parts = urlsplit(url)
+    connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+    paths = [f"/analyze/{quote(text, safe='')}" for text in TEXTS]
+    done = errors = 0
+    deadline = time.perf_counter() + duration
+    while time.perf_counter() < deadline:
+        try:
+            connection.request("GET", paths[done % len(paths)])
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors += 1
+        except (OSError, http.client.HTTPException):
+            errors += 1
+            connection.close()
+            connection = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=10)
+        done += 1
+    return done, errors
+
+
+def measure(url, clients, duration):
+    with Pool(clients) as pool:
+        results = pool.map(_client, [(url, duration)] * clients)
+    requests = sum(done for done, _ in results)
+    errors = sum(failed for _, failed in results)
+    return {"clients": clients, "requests": requests, "errors": errors, "rps": round(requests / duration, 1)}
+
+
+def wait_ready(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with urllib.request.urlopen(f"{url}/readyz", timeout=2) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready")
+
+
+def sweep(worker_counts, clients, duration, port):
+    url = f"http://127.0.0.1:{port}"
+    here = os.path.dirname(os.path.abspath(__file__))
+    results = []
+    for workers in worker_counts:
+        env = dict(os.environ, WORKERS=str(workers), THREADS="1", PORT=str(port), LOG_LEVEL="OFF")
+        server = subprocess.Popen(
+            [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py", "app:app"],
+            cwd=here, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            wait_ready(url)
+            result = measure(url, clients or workers * 4, duration)
+            result["workers"] = workers
+            results.append(result)
+            print(json.dumps(result), flush=True)
+        finally:
+            server.terminate()
+            server.wait()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Analyzer load test.")
+    parser.add_argument("--url", default="http://127.0.0.1:5000")
+    parser.add_argument("--clients", type=int, default=0, help="Client processes (default: 4 per server worker).")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per measurement.")
+    parser.add_argument("--sweep", help="Comma-separated worker counts to start locally and compare.")
+    parser.add_argument("--port", type=int, default=5055, help="Port for --sweep servers.")
+    args = parser.parse_args(argv)
+
+    if args.sweep:
+        sweep([int(count) for count in args.sweep.split(",")], args.clients, args.duration, args.port)
+    else:
+        print(json.dumps(measure(args.url, args.clients or os.cpu_count(), args.duration)))
+
+
+if __name__ == "__main__":
+    main()
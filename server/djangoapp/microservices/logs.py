@@ -0,0 +1,65 @@
+# Structured, sampled, non-blocking request logging for the analyzer.
+#
+#   LOG_LEVEL        standard level name, or OFF to disable request logs entirely
+#   LOG_SAMPLE_RATE  fraction of requests logged (0..1), default 0.01
+#
+# Records are JSON lines handed to a background thread through a queue, so the
+# request path never waits on a stdout write. Threads do not survive fork, so each
+# process starts its own listener: gunicorn's post_fork hook calls start_listener(),
+# and log_event() starts one lazily if the current pid has none.
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+import threading
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_SAMPLE_RATE = float(os.getenv("LOG_SAMPLE_RATE", 0.01))
+
+logger = logging.getLogger("sentiment")
+logger.propagate = False
+
+_listener = None
+_listener_pid = None
+_listener_lock = threading.Lock()
+
+if LOG_LEVEL == "OFF":
+    logger.disabled = True
+else:
+    logger.setLevel(LOG_LEVEL)
+
+
+def start_listener():
+    """Gives the current process its own queue, handler and listener thread."""
+    global _listener, _listener_pid
+    if logger.disabled:
+        return
+    with _listener_lock:
+        if _listener_pid == os.getpid():
+            return
+        # Handlers inherited from the parent feed a queue nobody drains here
+        for handler in list(logger.handlers):
+            logger.removeHandler(handler)
+        log_queue = queue.SimpleQueue()
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(logging.Formatter("%(message)s"))
+        _listener = logging.handlers.QueueListener(log_queue, stream)
+        _listener.start()
+        atexit.register(_listener.stop)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+        _listener_pid = os.getpid()
+
+
+def log_event(event, level=logging.INFO, sampled=True, **fields):
+    """Logs one JSON record; sampled records are kept with probability LOG_SAMPLE_RATE."""
+    if logger.disabled or not logger.isEnabledFor(level):
+        return
+    if sampled and (LOG_SAMPLE_RATE <= 0 or (LOG_SAMPLE_RATE < 1 and random.random() >= LOG_SAMPLE_RATE)):
+        return
+    if _listener_pid != os.getpid():
+        start_listener()
+    logger.log(level, json.dumps({"event": event, **fields}))
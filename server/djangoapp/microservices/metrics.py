@@ -0,0 +1,95 @@
+# Per-worker request metrics for the analyzer, exposed as Prometheus text.
+#
+# Each gunicorn worker keeps its own histograms (series carry a `pid` label), so
+# a scrape through the shared port sees whichever worker answered it.
+import os
+import time
+from bisect import bisect_left
+from threading import Lock
+
+from flask import g, request
+
+# Upper bounds in seconds; scoring is sub-millisecond, so the low end is finer
+# than the Prometheus client defaults
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+
+class Histogram:
+    """Labelled latency histogram with fixed buckets and a per-series error count."""
+
+    def __init__(self, name, help_text, label_names, buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # label values -> [bucket counts..., +Inf count, sum, errors]
+        self._lock = Lock()
+
+    def observe(self, labels, seconds, error=False):
+        index = bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += seconds
+            series[-1] += error
+
+    def render(self, extra_labels=""):
+        with self._lock:
+            snapshot = {labels: list(series) for labels, series in self._series.items()}
+        lines = [f"# HELP {self.name}_seconds {self.help_text}", f"# TYPE {self.name}_seconds histogram"]
+        errors = []
+        for labels, series in sorted(snapshot.items()):
+            label_text = extra_labels + ",".join(f'{key}="{_escape(value)}"'
+                                                 for key, value in zip(self.label_names, labels))
+            cumulative = 0
+            for bound, count in zip(self.buckets + ("+Inf",), series):
+                cumulative += count
+                lines.append(f'{self.name}_seconds_bucket{{{label_text},le="{bound}"}} {cumulative}')
+            lines.append(f"{self.name}_seconds_sum{{{label_text}}} {series[-2]:.6f}")
+            lines.append(f"{self.name}_seconds_count{{{label_text}}} {cumulative}")
+            errors.append(f"{self.name}_errors_total{{{label_text}}} {series[-1]}")
+        lines.append(f"# TYPE {self.name}_errors_total counter")
+        return "\n".join(lines + errors)
+
+
+def _escape(value):
+    """Label values must escape backslash, double quote and newline in the text format."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+request_latency = Histogram("analyzer_request", "Time spent handling requests, by route, method and status.",
+                            ("route", "method", "status"))
+
+
+def _start_timer():
+    g.metrics_started = time.perf_counter()
+
+
+def _observe(response):
+    started = g.pop("metrics_started", None)
+    if started is not None:
+        elapsed = time.perf_counter() - started
+        route = request.url_rule.rule if request.url_rule is not None else "unmatched"
+        request_latency.observe((route, request.method, str(response.status_code)), elapsed,
+                                response.status_code >= 500)
+        response.headers["Server-Timing"] = f"app;dur={elapsed * 1000:.3f}"
+    return response
+
+
+def init_app(app):
+    """Times every request of `app` (the /analyze/<text> rule is one series, not one per text)."""
+    app.before_request(_start_timer)
+    app.after_request(_observe)
+
+
+def render(gauges=None, counters=None):
+    """Prometheus text for the request histograms plus `gauges` and `counters` ({name: value})."""
+    pid = f'pid="{os.getpid()}"'
+    lines = [request_latency.render(pid + ",")]
+    for kind, values in (("gauge", gauges or {}), ("counter", counters or {})):
+        for name, value in sorted(values.items()):
+            lines.append(f"# TYPE {name} {kind}")
+            lines.append(f"{name}{{{pid}}} {value}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,226 @@
+"""
+Offline bulk rescoring of the reviews corpus.
+
+Streams reviews in id order from Mongo (needs `pip install pymongo`), straight
+from the data service's `/fetchReviews?format=ndjson` pages (following the
+`{"next_cursor": ...}` line that ends each page), or from an NDJSON export of
+those pages, scores them in chunks across a process pool (each worker loads the VADER lexicon once) and writes the
+labels back with unordered bulk updates, or to an NDJSON file.
+
+Progress is checkpointed after every written chunk, so an interrupted run picks
+up where it stopped when started again with the same --checkpoint file (or from
+the beginning with --restart). The checkpoint is removed once a run completes.
+Resuming from --url re-reads the pages before the checkpoint, since cursors are
+opaque, but only rescores the reviews after it.
+
+    python rescore.py --mongo-url mongodb://localhost:27017/ --workers 8
+    python rescore.py --url http://localhost:3030/fetchReviews --output sentiments.ndjson
+    python rescore.py --ndjson reviews.ndjson --output sentiments.ndjson
+
+Rescoring through Mongo bypasses the Express service, so rebuild the per-dealer
+review aggregates afterwards (`npm run stats:rebuild` in server/database).
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import urllib.request
+from collections import deque
+from multiprocessing import Pool
+from urllib.parse import urlencode
+
+from scoring import label_scores, load_analyzer
+
+# Largest page the data service streams (pagination.js MAX_LIMIT)
+PAGE_SIZE = 1000
+
+_sia = None
+
+
+def _init_worker():
+    global _sia
+    _sia = load_analyzer()
+
+
+def score_chunk(chunk):
+    """Scores [(id, text), ...] in a worker; returns [(id, label), ...]."""
+    return [(review_id, label_scores(_sia.polarity_scores(text))) for review_id, text in chunk]
+
+
+def read_checkpoint(path):
+    if path and os.path.exists(path):
+        with open(path) as handle:
+            return json.load(handle).get("last_id")
+    return None
+
+
+def write_checkpoint(path, last_id, processed):
+    if not path:
+        return
+    tmp = path + ".tmp"
+    with open(tmp, "w") as handle:
+        json.dump({"last_id": last_id, "processed": processed}, handle)
+    os.replace(tmp, path)  # atomic, so a crash never leaves a torn checkpoint
+
+
+def mongo_reviews(collection, after_id, chunk_size):
+    query = {"id": {"$gt": after_id}} if after_id is not None else {}
+    cursor = collection.find(query, {"_id": 0, "id": 1, "review": 1}).sort("id", 1).batch_size(chunk_size)
+    for document in cursor:
+        yield document["id"], document.get("review") or ""
+
+
+def _is_cursor_line(document):
+    # Every NDJSON page from the data service ends with {"next_cursor": C | null}
+    return document.keys() == {"next_cursor"}
+
+
+def ndjson_reviews(path, after_id):
+    # Exports from /fetchReviews?format=ndjson are ordered by id
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            if not line.strip():
+                continue
+            document = json.loads(line)
+            if _is_cursor_line(document):
+                continue
+            if after_id is None or document["id"] > after_id:
+                yield document["id"], document.get("review") or ""
+
+
+def http_reviews(url, after_id, page_size=PAGE_SIZE):
+    """Reads every /fetchReviews NDJSON page in order, continuing from each page's cursor line."""
+    cursor = None
+    while True:
+        params = {"format": "ndjson", "limit": page_size}
+        if cursor:
+            params["cursor"] = cursor
+        finished = False
+        with urllib.request.urlopen(f"{url}?{urlencode(params)}", timeout=60) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                document = json.loads(line)
+                if _is_cursor_line(document):
+                    cursor = document["next_cursor"]
+                    finished = True
+                    break
+                if "error" in document:
+                    raise RuntimeError(f"review stream failed: {document['error']}")
+                if after_id is None or document["id"] > after_id:
+                    yield document["id"], document.get("review") or ""
+        if not finished:
+            raise RuntimeError("review stream ended without a next_cursor line")
+        if cursor is None:
+            return
+
+
+def chunked(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def mongo_writer(collection):
+    from pymongo import UpdateOne
+
+    def write(results):
+        collection.bulk_write(
+            [UpdateOne({"id": review_id}, {"$set": {"sentiment": label}}) for review_id, label in results],
+            ordered=False,
+        )
+    return write
+
+
+def ndjson_writer(path):
+    def write(results):
+        with open(path, "a", encoding="utf-8") as handle:
+            handle.writelines(json.dumps({"id": review_id, "sentiment": label}) + "\n" for review_id, label in results)
+    return write
+
+
+def run(rows, write, workers, chunk_size, checkpoint, start_id):
+    processed = 0
+    started = time.perf_counter()
+    last_id = start_id
+    # Keep only a few chunks in flight so memory stays flat however large the corpus is
+    max_in_flight = workers * 2
+    in_flight = deque()
+
+    def drain_one():
+        nonlocal processed, last_id
+        results = in_flight.popleft().get()
+        write(results)
+        processed += len(results)
+        last_id = results[-1][0]
+        write_checkpoint(checkpoint, last_id, processed)
+        elapsed = time.perf_counter() - started
+        print(f"scored {processed} reviews (last id {last_id}) - {processed / elapsed:,.0f} reviews/s", flush=True)
+
+    with Pool(processes=workers, initializer=_init_worker) as pool:
+        for chunk in chunked(rows, chunk_size):
+            in_flight.append(pool.apply_async(score_chunk, (chunk,)))
+            if len(in_flight) >= max_in_flight:
+                drain_one()
+        while in_flight:
+            drain_one()
+
+    # A finished run leaves nothing to resume, so the next run starts from the beginning
+    if checkpoint and os.path.exists(checkpoint):
+        os.remove(checkpoint)
+
+    elapsed = time.perf_counter() - started
+    print(f"done: {processed} reviews in {elapsed:.1f}s ({processed / elapsed if elapsed else 0:,.0f} reviews/s)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Bulk rescore review sentiments.")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--mongo-url", help="Read from and write back to this Mongo server.")
+    source.add_argument("--url", help="Read reviews from the data service's /fetchReviews endpoint.")
+    source.add_argument("--ndjson", help="Read reviews from an NDJSON export.")
+    parser.add_argument("--db", default="dealershipsDB")
+    parser.add_argument("--output", help="Write {id, sentiment} lines here instead of updating Mongo.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=2000)
+    parser.add_argument("--checkpoint", default="rescore.checkpoint.json",
+                        help="Resume file, removed when a run completes.")
+    parser.add_argument("--restart", action="store_true",
+                        help="Ignore an existing checkpoint and rescore from the beginning.")
+    args = parser.parse_args(argv)
+
+    if (args.ndjson or args.url) and not args.output:
+        parser.error("--ndjson and --url need --output")
+
+    start_id = None if args.restart else read_checkpoint(args.checkpoint)
+    if start_id is None and args.output:
+        open(args.output, "w").close()  # a fresh run must not append to an earlier run's labels
+    if start_id is not None:
+        print(f"resuming after review id {start_id}")
+
+    if args.mongo_url:
+        try:
+            from pymongo import MongoClient
+        except ImportError:
+            sys.exit("pymongo is required for --mongo-url: pip install pymongo")
+        collection = MongoClient(args.mongo_url)[args.db]["reviews"]
+        rows = mongo_reviews(collection, start_id, args.chunk_size)
+        write = ndjson_writer(args.output) if args.output else mongo_writer(collection)
+    elif args.url:
+        rows = http_reviews(args.url, start_id)
+        write = ndjson_writer(args.output)
+    else:
+        rows = ndjson_reviews(args.ndjson, start_id)
+        write = ndjson_writer(args.output)
+
+    run(rows, write, args.workers, args.chunk_size, args.checkpoint, start_id)
+
+
+if __name__ == "__main__":
+    main()
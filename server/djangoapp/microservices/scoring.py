@@ -0,0 +1,113 @@
+# Scoring shared by the Flask service and the offline rescoring job
+import os
+import pickle
+import threading
+import zipfile
+from collections import OrderedDict
+
+from nltk.sentiment import SentimentIntensityAnalyzer
+from nltk.sentiment.vader import VaderConstants
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+LEXICON_ZIP = os.path.join(HERE, "sentiment", "vader_lexicon.zip")
+LEXICON_MEMBER = "vader_lexicon/vader_lexicon.txt"
+# Prebuilt {word: valence} dict written by build_lexicon.py
+COMPILED_LEXICON = os.getenv("COMPILED_LEXICON", os.path.join(HERE, "sentiment", "vader_lexicon.pickle"))
+
+
+# Parses the VADER lexicon text the same way SentimentIntensityAnalyzer.make_lex_dict does
+def parse_lexicon_zip(path=LEXICON_ZIP):
+    with zipfile.ZipFile(path) as archive:
+        text = archive.read(LEXICON_MEMBER).decode("utf-8")
+    lexicon = {}
+    for line in text.split("\n"):
+        if line.strip():
+            (word, measure) = line.strip().split("\t")[0:2]
+            lexicon[word] = float(measure)
+    return lexicon
+
+
+def analyzer_from_lexicon(lexicon):
+    # Same state SentimentIntensityAnalyzer.__init__ sets up, minus finding and parsing the file
+    sia = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+    sia.lexicon_file = None
+    sia.lexicon = lexicon
+    sia.constants = VaderConstants()
+    return sia
+
+
+# Loads the compiled lexicon if present, else the zip shipped in sentiment/,
+# else whatever NLTK finds on its data path
+def load_analyzer():
+    try:
+        with open(COMPILED_LEXICON, "rb") as handle:
+            return analyzer_from_lexicon(pickle.load(handle))
+    except (OSError, pickle.UnpicklingError, EOFError):
+        pass
+    if os.path.exists(LEXICON_ZIP):
+        return analyzer_from_lexicon(parse_lexicon_zip())
+    return SentimentIntensityAnalyzer()
+
+
+class PolarityMemo:
+    """
+    Bounded LRU memo in front of `sia.polarity_scores`.
+
+    Keys are the text with whitespace runs collapsed; case is kept because VADER
+    scores ALL-CAPS emphasis differently. Returned score dicts are shared
+    between callers and must not be mutated.
+    """
+
+    def __init__(self, sia, max_size):
+        self.sia = sia
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def polarity_scores(self, text):
+        if self.max_size <= 0:
+            return self.sia.polarity_scores(text)
+        key = " ".join(text.split())
+        with self._lock:
+            scores = self._entries.get(key)
+            if scores is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return scores
+            self.misses += 1
+        # Score outside the lock so threads only serialize on the dict bookkeeping
+        scores = self.sia.polarity_scores(key)
+        with self._lock:
+            self._entries[key] = scores
+            if len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return scores
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Maps VADER polarity scores to the positive / neutral / negative label
+def label_scores(scores):
+    pos = float(scores['pos'])
+    neg = float(scores['neg'])
+    neu = float(scores['neu'])
+    res = "positive"
+    if (neg > pos and neg > neu):
+        res = "negative"
+    elif (neu > neg and neu > pos):
+        res = "neutral"
+    return res
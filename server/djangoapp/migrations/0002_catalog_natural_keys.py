@@ -0,0 +1,58 @@
+"""
+Makes the catalog's natural keys unique so `seed_catalog` can bulk insert with
+`ignore_conflicts` (make name; make + model name + year).
+
+Databases that predate this migration may already hold duplicates: the old
+first-request `populate.initiate()` could run twice when concurrent `get_cars`
+requests both saw an empty table, and admin edits were unchecked. Before the
+constraints are added, duplicates are merged into the row with the lowest id:
+models of a duplicate make are moved to the surviving make, then duplicate
+models are deleted. Nothing else references these tables, so no data is lost
+beyond the repeated rows themselves.
+
+Databases whose tables were created before migrations were committed (e.g. with
+`migrate --run-syncdb`) should adopt the history with
+
+    python manage.py migrate djangoapp --fake-initial
+
+which fakes 0001 for the existing tables and then runs this dedupe.
+"""
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicates(apps, schema_editor):
+    CarMake = apps.get_model('djangoapp', 'CarMake')
+    CarModel = apps.get_model('djangoapp', 'CarModel')
+
+    duplicate_makes = CarMake.objects.values('name').annotate(keep=Min('id'), rows=Count('id')).filter(rows__gt=1)
+    for make in duplicate_makes:
+        extras = CarMake.objects.filter(name=make['name']).exclude(id=make['keep'])
+        CarModel.objects.filter(car_make__in=extras).update(car_make_id=make['keep'])
+        extras.delete()
+
+    duplicate_models = (CarModel.objects.values('car_make', 'name', 'year')
+                        .annotate(keep=Min('id'), rows=Count('id')).filter(rows__gt=1))
+    for car_model in duplicate_models:
+        CarModel.objects.filter(car_make=car_model['car_make'], name=car_model['name'],
+                                year=car_model['year']).exclude(id=car_model['keep']).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('djangoapp', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name='carmake',
+            name='name',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name='carmodel',
+            constraint=models.UniqueConstraint(fields=('car_make', 'name', 'year'), name='unique_car_model'),
+        ),
+    ]
@@ -9,7 +9,7 @@ from django.core.validators import MaxValueValidator, MinValueValidator
 # 🚀 Car Make Model: Represents the manufacturer details
 # <HINT> Create a Car Make model `class CarMake(models.Model)`:
 class CarMake(models.Model):
-    name = models.CharField(max_length=100)  # 🏭 Manufacturer Name
+    name = models.CharField(max_length=100, unique=True)  # 🏭 Manufacturer Name (natural key)
     description = models.TextField()  # 📝 Manufacturer Description
 
     # 🔹 __str__ method to return CarMake name
@@ -41,6 +41,17 @@ class CarModel(models.Model):
         ]
     )
 
+    class Meta:
+        # 🔑 Natural key that keeps bulk seeding idempotent
+        constraints = [
+            models.UniqueConstraint(fields=['car_make', 'name', 'year'], name='unique_car_model'),
+        ]
+
     # 🔹 __str__ method to display Car Make & Model
     def __str__(self):
-        return f"{self.car_make.name} {self.name}"  # 📌 Example: "Toyota Corolla"
\ No newline at end of file
+        return f"{self.car_make.name} {self.name}"  # 📌 Example: "Toyota Corolla"
+
+# 🔢 Catalog Version: single row bumped on every make/model change, so every process
+# can tell when its `get_cars` snapshot is stale (used when no shared cache is configured)
+class CatalogVersion(models.Model):
+    version = models.BigIntegerField(default=0)
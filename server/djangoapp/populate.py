@@ -1,41 +1,112 @@
 # Import models for CarMake and CarModel
+import csv
+import json
+
+from django.db import transaction
+
+from .catalog import catalog
 from .models import CarMake, CarModel
 
+BATCH_SIZE = 2000
+
+CAR_MAKE_DATA = [
+    {"name": "NISSAN", "description": "Great cars. Japanese technology"},
+    {"name": "Mercedes", "description": "Great cars. German technology"},
+    {"name": "Audi", "description": "Great cars. German technology"},
+    {"name": "Kia", "description": "Great cars. Korean technology"},
+    {"name": "Toyota", "description": "Great cars. Japanese technology"},
+]
+
+CAR_MODEL_DATA = [
+    {"name": "Pathfinder", "type": "SUV", "year": 2023, "make": "NISSAN"},
+    {"name": "Qashqai", "type": "SUV", "year": 2023, "make": "NISSAN"},
+    {"name": "XTRAIL", "type": "SUV", "year": 2023, "make": "NISSAN"},
+    {"name": "A-Class", "type": "SUV", "year": 2023, "make": "Mercedes"},
+    {"name": "C-Class", "type": "SUV", "year": 2023, "make": "Mercedes"},
+    {"name": "E-Class", "type": "SUV", "year": 2023, "make": "Mercedes"},
+    {"name": "A4", "type": "SUV", "year": 2023, "make": "Audi"},
+    {"name": "A5", "type": "SUV", "year": 2023, "make": "Audi"},
+    {"name": "A6", "type": "SUV", "year": 2023, "make": "Audi"},
+    {"name": "Sorrento", "type": "SUV", "year": 2023, "make": "Kia"},
+    {"name": "Carnival", "type": "SUV", "year": 2023, "make": "Kia"},
+    {"name": "Cerato", "type": "Sedan", "year": 2023, "make": "Kia"},
+    {"name": "Corolla", "type": "Sedan", "year": 2023, "make": "Toyota"},
+    {"name": "Camry", "type": "Sedan", "year": 2023, "make": "Toyota"},
+    {"name": "Kluger", "type": "SUV", "year": 2023, "make": "Toyota"},
+]
+
+
+def bulk_seed(car_make_data, car_model_data):
+    """
+    Inserts car makes and models with a handful of `bulk_create` calls in one
+    transaction.
+
+    Rows are matched on their natural keys (make name; make + model name + year),
+    so re-running a seed, or two seeds racing each other, never duplicates them.
+    Existing rows are left untouched.
+
+    Returns:
+        (makes_created, models_created)
+    """
+    with transaction.atomic():
+        makes_before = CarMake.objects.count()
+        CarMake.objects.bulk_create(
+            [CarMake(name=data['name'], description=data.get('description', '')) for data in car_make_data],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        make_ids = dict(CarMake.objects.values_list('name', 'id'))
+
+        models_before = CarModel.objects.count()
+        CarModel.objects.bulk_create(
+            [
+                CarModel(car_make_id=make_ids[data['make']], name=data['name'],
+                         type=data.get('type', 'SUV'), year=int(data.get('year', 2023)))
+                for data in car_model_data
+            ],
+            batch_size=BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        created = (CarMake.objects.count() - makes_before, CarModel.objects.count() - models_before)
+
+    # ✅ bulk_create sends no post_save signals, so invalidate the get_cars snapshot here
+    catalog.invalidate()
+    return created
+
+
+def load_catalog(path):
+    """
+    Reads a catalog file for `bulk_seed`.
+
+    JSON files hold {"makes": [{"name", "description"}], "models": [{"make", "name", "type", "year"}]}.
+    CSV files have one model per row with columns make, model, type, year and an
+    optional make_description.
+
+    Returns:
+        (car_make_data, car_model_data)
+    """
+    if path.endswith(".csv"):
+        makes = {}
+        models = []
+        with open(path, newline='', encoding='utf-8') as handle:
+            for row in csv.DictReader(handle):
+                makes.setdefault(row['make'], {"name": row['make'], "description": row.get('make_description') or ''})
+                models.append({"make": row['make'], "name": row['model'], "type": row.get('type') or 'SUV',
+                               "year": row.get('year') or 2023})
+        return list(makes.values()), models
+
+    with open(path, encoding='utf-8') as handle:
+        data = json.load(handle)
+    makes = data.get('makes', [])
+    known = {make['name'] for make in makes}
+    # ✅ Models may reference makes that are not listed explicitly
+    makes += [{"name": name, "description": ""} for name in {m['make'] for m in data.get('models', [])} - known]
+    return makes, data.get('models', [])
+
+
 def initiate():
     """
-    Populates the database with predefined car makes and car models
-    when the `get_cars` function is called for the first time.
+    Populates the database with the predefined car makes and car models.
+    Safe to call repeatedly; see the `seed_catalog` management command.
     """
-    car_make_data = [
-        {"name": "NISSAN", "description": "Great cars. Japanese technology"},
-        {"name": "Mercedes", "description": "Great cars. German technology"},
-        {"name": "Audi", "description": "Great cars. German technology"},
-        {"name": "Kia", "description": "Great cars. Korean technology"},
-        {"name": "Toyota", "description": "Great cars. Japanese technology"},
-    ]
-
-    car_make_instances = []
-    for data in car_make_data:
-        car_make_instances.append(CarMake.objects.create(name=data['name'], description=data['description']))
-
-    # Create CarModel instances with the corresponding CarMake instances
-    car_model_data = [
-        {"name": "Pathfinder", "type": "SUV", "year": 2023, "car_make": car_make_instances[0]},
-        {"name": "Qashqai", "type": "SUV", "year": 2023, "car_make": car_make_instances[0]},
-        {"name": "XTRAIL", "type": "SUV", "year": 2023, "car_make": car_make_instances[0]},
-        {"name": "A-Class", "type": "SUV", "year": 2023, "car_make": car_make_instances[1]},
-        {"name": "C-Class", "type": "SUV", "year": 2023, "car_make": car_make_instances[1]},
-        {"name": "E-Class", "type": "SUV", "year": 2023, "car_make": car_make_instances[1]},
-        {"name": "A4", "type": "SUV", "year": 2023, "car_make": car_make_instances[2]},
-        {"name": "A5", "type": "SUV", "year": 2023, "car_make": car_make_instances[2]},
-        {"name": "A6", "type": "SUV", "year": 2023, "car_make": car_make_instances[2]},
-        {"name": "Sorrento", "type": "SUV", "year": 2023, "car_make": car_make_instances[3]},
-        {"name": "Carnival", "type": "SUV", "year": 2023, "car_make": car_make_instances[3]},
-        {"name": "Cerato", "type": "Sedan", "year": 2023, "car_make": car_make_instances[3]},
-        {"name": "Corolla", "type": "Sedan", "year": 2023, "car_make": car_make_instances[4]},
-        {"name": "Camry", "type": "Sedan", "year": 2023, "car_make": car_make_instances[4]},
-        {"name": "Kluger", "type": "SUV", "year": 2023, "car_make": car_make_instances[4]},
-    ]
-
-    for data in car_model_data:
-        CarModel.objects.create(name=data['name'], car_make=data['car_make'], type=data['type'], year=data['year'])
\ No newline at end of file
+    return bulk_seed(CAR_MAKE_DATA, CAR_MODEL_DATA)
@@ -1,7 +1,13 @@
 # ✅ Import required modules
 import requests  # ✅ Added to enable API calls
+import contextvars
+import json
 import os
+from concurrent.futures import ThreadPoolExecutor, wait
+from threading import Lock
+from urllib.parse import quote
 from dotenv import load_dotenv
+from .http_client import http_client
 
 # ✅ Load environment variables from .env file
 load_dotenv()
@@ -10,20 +16,21 @@ load_dotenv()
 backend_url = os.getenv('backend_url', default="http://localhost:3030").rstrip("/")  # ✅ Ensure no trailing slash
 sentiment_analyzer_url = os.getenv('sentiment_analyzer_url', default="http://localhost:5050/").rstrip("/")  # ✅ Ensure no trailing slash
 
-# ✅ Improved GET Request Handling (deep seek change )
-def get_request(url, **kwargs):
-    try:
-        response = requests.get(url, headers={'Content-Type': 'application/json'}, params=kwargs)
-        response.raise_for_status()
-    except requests.exceptions.RequestException as e:
-        print("Network exception:", e)
-    return response.json()
-   
+# ✅ Sentiment fan-out tuning (concurrency limit, per-call timeout, whole-request deadline in seconds)
+SENTIMENT_MAX_WORKERS = int(os.getenv('SENTIMENT_MAX_WORKERS', 8))
+SENTIMENT_CALL_TIMEOUT = float(os.getenv('SENTIMENT_CALL_TIMEOUT', 2.0))
+SENTIMENT_DEADLINE = float(os.getenv('SENTIMENT_DEADLINE', 5.0))
+
+_sentiment_executor = None
+_sentiment_executor_lock = Lock()
+
+# ✅ Improved GET Request Handling (pooled client, relative endpoints or absolute URLs)
+def get_request(endpoint, **kwargs):
     """
     Function to make GET requests to the backend API.
 
     Args:
-        endpoint (str): The API endpoint to be requested.
+        endpoint (str): The API endpoint (or absolute URL) to be requested.
         kwargs: URL parameters to be passed as query strings.
 
     Returns:
@@ -33,13 +40,14 @@ def get_request(url, **kwargs):
     if "state" in kwargs and kwargs["state"] == "All":
         del kwargs["state"]  # ✅ Remove `state` parameter if "All" is selected
 
-    params = "&".join(f"{key}={value}" for key, value in kwargs.items()) if kwargs else ""
-    
-    request_url = f"{backend_url}/{endpoint}?{params}".rstrip("?")  # ✅ Ensure proper URL formatting
+    if endpoint.startswith(("http://", "https://")):
+        request_url = endpoint
+    else:
+        request_url = f"{backend_url}/{endpoint.lstrip('/')}"  # ✅ Ensure proper URL formatting
     print(f"🔍 GET from {request_url}")  # ✅ Debugging log to verify request
 
     try:
-        response = requests.get(request_url)
+        response = http_client.get(request_url, params=kwargs)
 
         if response.status_code != 200:
             print(f"⚠️ Backend returned {response.status_code}: {response.text}")
@@ -53,25 +61,46 @@ def get_request(url, **kwargs):
         print(f"❌ Network Exception: {err}")
         return {"error": f"Request failed: {str(err)}"}
 
+# ✅ Streaming GET for NDJSON listings (`format=ndjson`)
+def stream_request(endpoint, **kwargs):
+    """
+    Generator that yields one decoded document per NDJSON line from the backend.
+
+    Args:
+        endpoint (str): The API endpoint to be requested.
+        kwargs: URL parameters to be passed as query strings.
+
+    Raises:
+        requests.exceptions.RequestException: If the backend call fails.
+    """
+    request_url = f"{backend_url}/{endpoint.lstrip('/')}"
+    print(f"🔍 Streaming GET from {request_url}")
+
+    kwargs["format"] = "ndjson"
+    with http_client.get(request_url, params=kwargs, stream=True) as response:
+        response.raise_for_status()
+        for line in response.iter_lines():
+            if line:
+                yield json.loads(line)
+
 # ✅ FIXED `analyze_review_sentiments` Function
-def analyze_review_sentiments(text):
-    # ✅ FIXED: Use environment variable
-    url = os.getenv('sentiment_analyzer_url') + "/analyze/" + text
-    return get_request(url)
+def analyze_review_sentiments(text, timeout=None):
     """
     Function to analyze sentiment using the deployed microservice.
 
     Args:
         text (str): The text to analyze.
+        timeout (float): Optional per-call timeout in seconds.
 
     Returns:
         JSON response containing sentiment analysis.
     """
-    request_url = f"{sentiment_analyzer_url}/analyze/{text}"
+    # ✅ Quote the text so "/" or "?" in a review cannot break the URL path
+    request_url = f"{sentiment_analyzer_url}/analyze/{quote(text, safe='')}"
     print(f"🔍 Calling sentiment analyzer at {request_url}")
 
     try:
-        response = requests.get(request_url)
+        response = http_client.get(request_url, timeout=timeout or http_client.timeout)
 
         if response.status_code != 200:
             print(f"⚠️ Sentiment Analyzer returned {response.status_code}: {response.text}")
@@ -85,6 +114,101 @@ def analyze_review_sentiments(text):
         print(f"❌ Network Exception: {err}")
         return {"sentiment": "neutral", "error": f"Request failed: {str(err)}"}
 
+# ✅ Batch sentiment scoring (one round trip per page of reviews)
+def analyze_review_sentiments_batch(texts, timeout=None):
+    """
+    Function to score many texts with a single call to the analyzer's
+    `/analyze/batch` endpoint.
+
+    Args:
+        texts (list): The texts to analyze.
+        timeout (float): Optional timeout, defaults to SENTIMENT_DEADLINE.
+
+    Returns:
+        List of sentiment labels in the same order as `texts`, or None if
+        the batch call failed so the caller can fall back to per-text calls.
+    """
+    if not texts:
+        return []
+
+    request_url = f"{sentiment_analyzer_url}/analyze/batch"
+    print(f"🔍 POST {len(texts)} texts to sentiment analyzer at {request_url}")
+
+    try:
+        response = http_client.post(
+            request_url,
+            json=list(texts),
+            timeout=SENTIMENT_DEADLINE if timeout is None else timeout,
+        )
+
+        if response.status_code != 200:
+            print(f"⚠️ Sentiment Analyzer returned {response.status_code}: {response.text}")
+            return None
+
+        sentiments = response.json().get("sentiments", [])
+        if len(sentiments) != len(texts):
+            print(f"⚠️ Sentiment Analyzer returned {len(sentiments)} labels for {len(texts)} texts")
+            return None
+
+        return [item.get("sentiment", "neutral") for item in sentiments]
+    except (requests.exceptions.JSONDecodeError, AttributeError):
+        print(f"❌ Invalid JSON from Sentiment Analyzer at {request_url}")
+        return None
+    except requests.exceptions.RequestException as err:
+        print(f"❌ Network Exception: {err}")
+        return None
+
+def _get_sentiment_executor():
+    """Lazily build the shared, bounded worker pool used for sentiment fan-out."""
+    global _sentiment_executor
+    if _sentiment_executor is None:
+        with _sentiment_executor_lock:
+            if _sentiment_executor is None:
+                _sentiment_executor = ThreadPoolExecutor(
+                    max_workers=SENTIMENT_MAX_WORKERS,
+                    thread_name_prefix="sentiment",
+                )
+    return _sentiment_executor
+
+# ✅ Concurrent sentiment fan-out
+def analyze_review_sentiments_concurrent(texts, call_timeout=None, deadline=None, default="neutral"):
+    """
+    Scores many texts concurrently through a bounded worker pool.
+
+    Args:
+        texts (list): The texts to analyze.
+        call_timeout (float): Per-call timeout, defaults to SENTIMENT_CALL_TIMEOUT.
+        deadline (float): Budget for the whole batch, defaults to SENTIMENT_DEADLINE.
+        default: Label reported for calls that fail or miss the deadline.
+
+    Returns:
+        List of sentiment labels in the same order as `texts`. Calls that fail
+        or do not finish before the deadline come back as `default`.
+    """
+    call_timeout = SENTIMENT_CALL_TIMEOUT if call_timeout is None else call_timeout
+    deadline = SENTIMENT_DEADLINE if deadline is None else deadline
+
+    executor = _get_sentiment_executor()
+    # ✅ Run each call in a copy of the caller's context so per-request metrics see it
+    futures = [executor.submit(contextvars.copy_context().run, analyze_review_sentiments, text, call_timeout)
+               for text in texts]
+    done, not_done = wait(futures, timeout=deadline)
+
+    for future in not_done:
+        future.cancel()  # ✅ Free queued slots so late calls don't hold the pool
+    if not_done:
+        print(f"⚠️ Sentiment deadline hit: {len(not_done)} of {len(futures)} reviews marked neutral")
+
+    labels = []
+    for future in futures:
+        label = default
+        if future in done and future.exception() is None:
+            result = future.result()
+            if isinstance(result, dict) and "sentiment" in result and "error" not in result:
+                label = result["sentiment"]
+        labels.append(label)
+    return labels
+
 # ✅ Improved POST Request Handling
 def post_review(data_dict):
     """
@@ -100,7 +224,7 @@ def post_review(data_dict):
     print(f"🔍 POST to {request_url}")
 
     try:
-        response = requests.post(request_url, json=data_dict)
+        response = http_client.post(request_url, json=data_dict)
 
         if response.status_code != 200:
             print(f"⚠️ Backend returned {response.status_code}: {response.text}")
@@ -113,4 +237,116 @@ def post_review(data_dict):
         return {"status": "failed", "error": "Invalid JSON response"}
     except requests.exceptions.RequestException as err:
         print(f"❌ Network Exception: {err}")
-        return {"status": "failed", "error": f"Request failed: {str(err)}"}
\ No newline at end of file
+        return {"status": "failed", "error": f"Request failed: {str(err)}"}
+
+# ✅ Store precomputed sentiments on existing reviews
+def update_review_sentiments(updates):
+    """
+    Function to write sentiments back to stored reviews in bulk.
+
+    Args:
+        updates (list): List of {"id": review_id, "sentiment": label} dicts.
+
+    Returns:
+        JSON response from the backend.
+    """
+    request_url = f"{backend_url}/update_sentiments"
+    print(f"🔍 POST {len(updates)} sentiments to {request_url}")
+
+    try:
+        response = http_client.post(request_url, json=updates)
+
+        if response.status_code != 200:
+            print(f"⚠️ Backend returned {response.status_code}: {response.text}")
+            return {"error": f"Backend error {response.status_code}", "details": response.text}
+
+        return response.json()
+    except requests.exceptions.JSONDecodeError:
+        print(f"❌ Invalid JSON response from backend at {request_url}")
+        return {"status": "failed", "error": "Invalid JSON response"}
+    except requests.exceptions.RequestException as err:
+        print(f"❌ Network Exception: {err}")
+        return {"status": "failed", "error": f"Request failed: {str(err)}"}
+
+# ✅ Inventory search
+INVENTORY_FILTERS = ("make", "model", "body_type", "year_min", "year_max", "max_mileage", "limit", "cursor")
+
+def search_cars(dealer_id, **filters):
+    """
+    Function to search a dealer's inventory in the backend.
+
+    Args:
+        dealer_id (int): The dealer whose cars are searched.
+        filters: Any of make, model, body_type, year_min, year_max,
+            max_mileage, limit and cursor. Unknown or empty filters are dropped.
+
+    Returns:
+        JSON page {"items": [...], "next_cursor": ...} or an {"error": ...} dict.
+    """
+    params = {key: value for key, value in filters.items() if key in INVENTORY_FILTERS and value not in (None, "")}
+    return get_request(f"/fetchCars/{dealer_id}", **params)
+
+def get_car_facets(dealer_id, **filters):
+    """
+    Function to fetch filter-UI counts for a dealer's inventory.
+
+    Args:
+        dealer_id (int): The dealer whose cars are counted.
+        filters: The same filters accepted by `search_cars` (paging is ignored).
+
+    Returns:
+        JSON {"total", "makes", "models", "years", "body_types", "mileage"} or an {"error": ...} dict.
+    """
+    params = {key: value for key, value in filters.items()
+              if key in INVENTORY_FILTERS and key not in ("limit", "cursor") and value not in (None, "")}
+    return get_request(f"/fetchCars/{dealer_id}/facets", **params)
+
+# ✅ Nearest-dealer search (2dsphere index in the backend)
+def get_dealers_near(lat, lng, radius_km=None, k=None):
+    """
+    Function to fetch the dealers closest to a point.
+
+    Args:
+        lat (float): Latitude of the point.
+        lng (float): Longitude of the point.
+        radius_km (float): Optional search radius in kilometres.
+        k (int): Optional maximum number of dealers (backend caps it at 100).
+
+    Returns:
+        JSON list of dealers sorted by `distance_km`, or an {"error": ...} dict.
+    """
+    params = {"lat": lat, "lng": lng, "radius_km": radius_km, "k": k}
+    return get_request("/fetchDealersNear", **{key: value for key, value in params.items() if value is not None})
+
+# ✅ Full-text review search (Mongo text index in the backend)
+REVIEW_SEARCH_FILTERS = ("dealer", "make", "model", "year", "sentiment", "limit", "cursor")
+
+def search_reviews(q, **filters):
+    """
+    Function to run a ranked keyword search over review text.
+
+    Args:
+        q (str): The search terms.
+        filters: Any of dealer, make, model, year, sentiment, limit and
+            cursor. Unknown or empty filters are dropped.
+
+    Returns:
+        JSON page {"items": [...], "next_cursor": ...} (each hit carries
+        `score` and `snippet`) or an {"error": ...} dict.
+    """
+    params = {key: value for key, value in filters.items() if key in REVIEW_SEARCH_FILTERS and value not in (None, "")}
+    return get_request("/searchReviews", q=q, **params)
+
+# ✅ Precomputed per-dealer review aggregates
+def get_review_stats(dealer_id):
+    """
+    Function to fetch a dealer's review summary (count, sentiment histogram,
+    last review time and make/model/year breakdowns).
+
+    Args:
+        dealer_id (int): The dealer to summarise.
+
+    Returns:
+        JSON summary or an {"error": ...} dict.
+    """
+    return get_request(f"/fetchReviewStats/dealer/{dealer_id}")
\ No newline at end of file
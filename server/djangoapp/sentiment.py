@@ -0,0 +1,209 @@
+# ✅ Sentiment result cache for the Django tier
+import hashlib
+import logging
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+
+from asgiref.sync import sync_to_async
+from django.core.cache import caches
+
+from . import async_restapis
+from .restapis import (
+    SENTIMENT_CALL_TIMEOUT,
+    SENTIMENT_DEADLINE,
+    analyze_review_sentiments_batch,
+    analyze_review_sentiments_concurrent,
+)
+
+logger = logging.getLogger(__name__)
+
+# ✅ Cache tuning: LRU size, TTL in seconds (0 = never expire) and optional shared
+# Django cache alias (e.g. "default") that lets every worker reuse the same results
+SENTIMENT_CACHE_SIZE = int(os.getenv('SENTIMENT_CACHE_SIZE', 10000))
+SENTIMENT_CACHE_TTL = int(os.getenv('SENTIMENT_CACHE_TTL', 7 * 24 * 3600))
+SENTIMENT_CACHE_BACKEND = os.getenv('SENTIMENT_CACHE_BACKEND', '')
+
+KEY_PREFIX = "sentiment:"
+
+
+def review_key(text):
+    """Cache key for a review: a hash of its text, which never changes once stored."""
+    return KEY_PREFIX + hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class SentimentCache:
+    """
+    Two-level sentiment cache.
+
+    A bounded in-process LRU answers hot lookups without any I/O; an optional
+    shared Django cache backend lets results survive restarts and be shared
+    between worker processes. Both levels honour the same TTL.
+    """
+
+    def __init__(self, max_size=SENTIMENT_CACHE_SIZE, ttl=SENTIMENT_CACHE_TTL, backend=SENTIMENT_CACHE_BACKEND):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.backend = backend
+        self._entries = OrderedDict()  # key -> (label, expires_at)
+        self._lock = Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _shared(self):
+        return caches[self.backend] if self.backend else None
+
+    def get_many(self, keys):
+        """Returns {key: label} for every key found in either level."""
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                label, expires_at = entry
+                if expires_at and expires_at <= now:
+                    del self._entries[key]
+                    continue
+                self._entries.move_to_end(key)
+                found[key] = label
+            self.hits += len(found)
+
+        missing = [key for key in keys if key not in found]
+        shared = self._shared()
+        if missing and shared is not None:
+            try:
+                shared_found = shared.get_many(missing)
+            except Exception as e:
+                logger.error(f"❌ Shared sentiment cache read failed: {e}")
+                shared_found = {}
+            if shared_found:
+                self._store_local(shared_found)
+                found.update(shared_found)
+                with self._lock:
+                    self.shared_hits += len(shared_found)
+
+        with self._lock:
+            self.misses += len(set(keys) - set(found))
+        return found
+
+    def set_many(self, mapping):
+        """Stores {key: label} in both levels."""
+        if not mapping:
+            return
+        self._store_local(mapping)
+        shared = self._shared()
+        if shared is not None:
+            try:
+                shared.set_many(mapping, timeout=self.ttl or None)
+            except Exception as e:
+                logger.error(f"❌ Shared sentiment cache write failed: {e}")
+
+    def _store_local(self, mapping):
+        expires_at = time.monotonic() + self.ttl if self.ttl else 0
+        with self._lock:
+            for key, label in mapping.items():
+                self._entries[key] = (label, expires_at)
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.shared_hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.shared_hits) / lookups if lookups else 0.0,
+            }
+
+
+sentiment_cache = SentimentCache()
+
+
+def _pending(texts):
+    """Cache keys for `texts`, the labels already cached and the distinct misses."""
+    keys = [review_key(text) for text in texts]
+    labels = sentiment_cache.get_many(keys)
+    pending = {}
+    for key, text in zip(keys, texts):
+        if key not in labels:
+            pending.setdefault(key, text)  # ✅ Score each distinct missing text once
+    return keys, labels, pending
+
+
+def _remember(pending_keys, scored, labels):
+    fresh = {key: label for key, label in zip(pending_keys, scored) if label is not None}
+    sentiment_cache.set_many(fresh)
+    labels.update(fresh)
+
+
+def _remaining(deadline):
+    """Seconds left before `deadline` (a `time.monotonic()` value), or None if it has passed."""
+    remaining = deadline - time.monotonic()
+    return remaining if remaining > 0 else None
+
+
+def get_sentiments(texts, default="neutral"):
+    """
+    Returns a sentiment label for every text, in order.
+
+    Cached labels are served directly; only misses go to the analyzer, first as
+    one batch call and then, if that fails, as a concurrent per-text fan-out.
+    Both share one SENTIMENT_DEADLINE budget: the fan-out only gets what the
+    batch call left, and is skipped once it is spent. Failed or late lookups
+    are reported as `default` but are not cached.
+    """
+    deadline = time.monotonic() + SENTIMENT_DEADLINE
+    keys, labels, pending = _pending(texts)
+
+    if pending:
+        pending_keys = list(pending)
+        pending_texts = [pending[key] for key in pending_keys]
+        scored = analyze_review_sentiments_batch(pending_texts, timeout=SENTIMENT_DEADLINE)
+        if scored is None:
+            remaining = _remaining(deadline)
+            if remaining is None:
+                scored = [None] * len(pending_texts)
+            else:
+                scored = analyze_review_sentiments_concurrent(
+                    pending_texts, call_timeout=min(SENTIMENT_CALL_TIMEOUT, remaining), deadline=remaining,
+                    default=None)
+        _remember(pending_keys, scored, labels)
+
+    return [labels.get(key, default) for key in keys]
+
+
+async def aget_sentiments(texts, default="neutral"):
+    """Async version of `get_sentiments` for the ASGI views."""
+    deadline = time.monotonic() + SENTIMENT_DEADLINE
+    keys, labels, pending = await sync_to_async(_pending)(texts)
+
+    if pending:
+        pending_keys = list(pending)
+        pending_texts = [pending[key] for key in pending_keys]
+        scored = await async_restapis.analyze_review_sentiments_batch(pending_texts, timeout=SENTIMENT_DEADLINE)
+        if scored is None:
+            remaining = _remaining(deadline)
+            if remaining is None:
+                scored = [None] * len(pending_texts)
+            else:
+                scored = await async_restapis.analyze_review_sentiments_concurrent(
+                    pending_texts, call_timeout=min(SENTIMENT_CALL_TIMEOUT, remaining), deadline=remaining,
+                    default=None)
+        await sync_to_async(_remember)(pending_keys, scored, labels)
+
+    return [labels.get(key, default) for key in keys]
@@ -0,0 +1,30 @@
+# ✅ Model signal handlers
+from django.contrib.auth import get_user_model
+from django.contrib.auth.signals import user_logged_out
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .backends import invalidate_user
+from .catalog import catalog
+from .models import CarMake, CarModel
+
+
+@receiver([post_save, post_delete], sender=CarMake)
+@receiver([post_save, post_delete], sender=CarModel)
+def invalidate_catalog(sender, **kwargs):
+    """Admin edits to makes or models invalidate the `get_cars` snapshot in every process (after commit)."""
+    transaction.on_commit(catalog.invalidate)
+
+
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_cached_user(sender, instance, **kwargs):
+    """Profile, password, permission or last-login changes drop the cached user."""
+    invalidate_user(instance.pk)
+
+
+@receiver(user_logged_out)
+def invalidate_user_on_logout(sender, user, **kwargs):
+    """Logout flushes the cached session; drop the cached user along with it."""
+    if user is not None:
+        invalidate_user(user.pk)
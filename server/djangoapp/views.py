@@ -1,15 +1,20 @@
 # ✅ Import required modules
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+import itertools
 import json
 import logging
 from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate, login, logout
+from django.conf import settings
 from django.contrib.auth.models import User
 import requests  # ✅ Added to enable API calls
-from .models import CarMake, CarModel  
-from .populate import initiate  
-from .restapis import get_request, analyze_review_sentiments, post_review  
+from .catalog import catalog  
+from .restapis import get_car_facets, get_dealers_near, get_request, get_review_stats, post_review, search_cars, search_reviews, stream_request  
+from .sentiment import get_sentiments  
+from .dealer_cache import dealer_cache  
 
 # ✅ Logger setup
 logger = logging.getLogger(__name__)
@@ -87,7 +92,7 @@ def register_user(request):
 
     try:
         user = User.objects.create_user(username=username, first_name=first_name, last_name=last_name, password=password, email=email)
-        login(request, user)
+        login(request, user, backend=settings.AUTHENTICATION_BACKENDS[0])  # ✅ Required when several backends are configured
         request.session.save()  # ✅ Ensure session is saved
 
         response = json_response({"userName": username, "status": "Authenticated"})
@@ -103,64 +108,249 @@ def register_user(request):
 
 def get_cars(request):
     try:
-        count = CarMake.objects.count()
-        if count == 0:
-            initiate()  
-        car_models = CarModel.objects.select_related('car_make')
-        cars = [{"CarModel": car_model.name, "CarMake": car_model.car_make.name} for car_model in car_models]
-        return json_response({"CarModels": cars})
+        # ✅ Prebuilt snapshot: rebuilt only after an admin edit bumps the catalog version
+        return HttpResponse(catalog.body(), content_type="application/json")
     except Exception as e:
         logger.error(f"❌ Error fetching car models: {e}")
         return json_response({"error": "Failed to retrieve cars"}, status=500)
 
 # ===== 🏬 Fetch Dealerships & Reviews =====
 
+# ✅ Pagination: `limit` and the opaque `cursor` are passed through to the backend,
+# and `format=ndjson` streams the listing instead of building one big payload
+STREAM_CHUNK_SIZE = 100
+
+def _page_params(request):
+    return {key: request.GET[key] for key in ("limit", "cursor") if key in request.GET}
+
+def _wants_ndjson(request):
+    return request.GET.get("format") == "ndjson" or "application/x-ndjson" in request.headers.get("Accept", "")
+
+def _is_cursor_line(document):
+    # ✅ The backend ends every NDJSON stream with {"next_cursor": C | null}
+    return isinstance(document, dict) and document.keys() == {"next_cursor"}
+
+def _ndjson_response(documents, prepare=None):
+    """
+    Streams `documents` as NDJSON, handing each chunk to `prepare` before it is
+    written. The backend's closing `{"next_cursor": ...}` line is passed through
+    untouched, so clients continue with `?cursor=<next_cursor>`.
+    """
+    def encode(chunk):
+        if prepare:
+            prepare(chunk)
+        return "".join(json.dumps(item) + "\n" for item in chunk)
+
+    def lines():
+        chunk = []
+        try:
+            for document in documents:
+                if _is_cursor_line(document):
+                    yield (encode(chunk) if chunk else "") + json.dumps(document) + "\n"
+                    chunk = []
+                    continue
+                chunk.append(document)
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    yield encode(chunk)
+                    chunk = []
+            if chunk:
+                yield encode(chunk)
+        except Exception as e:
+            # ✅ Status and headers are already sent, so report the failure in-band as a final line
+            logger.error(f"❌ NDJSON stream aborted: {e}")
+            yield json.dumps({"error": "Stream aborted"}) + "\n"
+
+    return StreamingHttpResponse(lines(), content_type="application/x-ndjson")
+
+def _paged_listing(endpoint, request, key, prepare=None):
+    """Proxies one cursor page (or an NDJSON stream) of a backend listing."""
+    params = _page_params(request)
+    if _wants_ndjson(request):
+        documents = stream_request(endpoint, **params)
+        try:
+            # ✅ Open the upstream stream before committing to a 200, so connect/HTTP errors become a 502
+            first = next(documents, None)
+        except (requests.exceptions.RequestException, ValueError) as e:
+            logger.error(f"❌ NDJSON stream failed to start: {e}")
+            return json_response({"status": 502, "error": "Request failed"}, status=502)
+        if first is not None:
+            documents = itertools.chain([first], documents)
+        return _ndjson_response(documents, prepare)
+
+    page = get_request(endpoint, **params)
+    if not isinstance(page, dict) or "error" in page:
+        return json_response({"status": 502, "error": page.get("error") if isinstance(page, dict) else "Bad response"})
+
+    items = page.get("items", [])
+    if prepare:
+        prepare(items)
+    return json_response({"status": 200, key: items, "next_cursor": page.get("next_cursor")})
+
 def get_dealerships(request, state="All"):
-    session = requests.Session()
-    endpoint = "/fetchDealers" if state == "All" else f"/fetchDealers/{state}"
+    """
+    Serves the dealer listing for one state (or "All") from the response cache.
+
+    Responses carry ETag/Last-Modified so browsers can revalidate with a 304.
+    Paged (`limit`/`cursor`) and NDJSON requests go straight to the backend.
+    """
+    if _page_params(request) or _wants_ndjson(request):
+        endpoint = "/fetchDealers" if state == "All" else f"/fetchDealers/{state}"
+        return _paged_listing(endpoint, request, "dealers")
+
+    return dealer_listing_response(request, dealer_cache.get(state))
+
+def dealer_listing_response(request, entry):
+    """Builds the (possibly 304) dealer listing response for a `dealer_cache` entry."""
+    if entry is None:
+        return json_response({"status": 500, "error": "Request failed"})
+
+    response = get_conditional_response(request, etag=entry["etag"], last_modified=entry["last_modified"])
+    if response is None:
+        response = HttpResponse(entry["body"], content_type="application/json")
+    response["ETag"] = entry["etag"]
+    response["Last-Modified"] = http_date(entry["last_modified"])
+    response["Cache-Control"] = "public, max-age=0, must-revalidate"
+    return response
+
+@csrf_exempt
+def invalidate_dealerships(request, state=None):
+    """
+    Drops cached dealer listings (one state plus "All", or everything). Staff only.
+
+    Needs a shared cache (REDIS_URL); without one it answers 409.
+    """
+    if request.method != "POST":
+        return json_response({"status": 405, "message": "Method Not Allowed"}, status=405)
+
+    if not request.user.is_staff:
+        return json_response({"status": 403, "message": "Unauthorized"}, status=403)
 
-    headers = {}
+    if not dealer_cache.shared:
+        # ✅ A per-process cache would only be cleared in the worker serving this request
+        message = f"Dealer cache is per-process; listings refresh within {dealer_cache.ttl}s"
+        return json_response({"status": 409, "message": message}, status=409)
 
-    if request.user.is_authenticated:
-        session_cookies = request.COOKIES
-        headers["Cookie"] = "; ".join([f"{key}={value}" for key, value in session_cookies.items()])
-        session_id = request.session.session_key
-        if session_id:
-            headers["Authorization"] = f"Bearer {session_id}"
+    dealer_cache.invalidate(state)
+    logger.info(f"✅ Dealer cache invalidated for '{state or 'All'}'.")
+    return json_response({"status": 200, "invalidated": state or "All"})
 
+def get_nearby_dealerships(request):
+    """Dealers closest to `?lat=&lng=`, sorted by distance (optional `radius_km` and `k`)."""
     try:
-        BACKEND_SERVICE_HOST = os.getenv("BACKEND_SERVICE_HOST", "backend-service")
-        response = session.get(f"http://{BACKEND_SERVICE_HOST}:8888{endpoint}", headers=headers)
+        lat = float(request.GET["lat"])
+        lng = float(request.GET["lng"])
+        radius_km = float(request.GET["radius_km"]) if request.GET.get("radius_km") else None
+        k = int(request.GET["k"]) if request.GET.get("k") else None
+    except (KeyError, ValueError):
+        return json_response({"status": 400, "error": "lat and lng are required numbers"}, status=400)
 
-        logger.debug(f"🔍 Response Status: {response.status_code}")
-        logger.debug(f"🔍 Response Content: {response.text[:500]}")
+    if not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return json_response({"status": 400, "error": "lat/lng out of range"}, status=400)
 
-        if "application/json" not in response.headers.get("Content-Type", ""):
-            return json_response({"status": 500, "error": "Backend did not return JSON. Check authentication."})
+    try:
+        dealers = get_dealers_near(lat, lng, radius_km=radius_km, k=k)
 
-        return json_response({"status": 200, "dealers": response.json()})
-    except requests.exceptions.RequestException as req_err:
-        logger.error(f"❌ Request Exception: {req_err}")
-        return json_response({"status": 500, "error": "Request failed"})
+        if not isinstance(dealers, list):
+            return json_response({"status": 502, "error": dealers.get("error") if isinstance(dealers, dict) else "Bad response"})
+
+        return json_response({"status": 200, "dealers": dealers})
+    except Exception as e:
+        logger.error(f"❌ Error fetching nearby dealers: {e}")
+        return json_response({"status": 500, "error": "Failed to retrieve nearby dealers"})
+
+def _add_missing_sentiments(reviews):
+    """
+    Sentiment is stored at insert time; only legacy rows without it are scored
+    here (cache first, then one batch call for the misses).
+    """
+    legacy = [review for review in reviews if not review.get('sentiment')]
+    if legacy:
+        sentiments = get_sentiments([review['review'] for review in legacy])
+        for review, sentiment in zip(legacy, sentiments):
+            review['sentiment'] = sentiment
 
 # ✅ **Re-added `get_dealer_reviews`**
 def get_dealer_reviews(request, dealer_id):
     try:
         endpoint = f"/fetchReviews/dealer/{dealer_id}"
+        if _page_params(request) or _wants_ndjson(request):
+            return _paged_listing(endpoint, request, "reviews", _add_missing_sentiments)
+
         reviews = get_request(endpoint)
 
+        if isinstance(reviews, dict) and "error" in reviews:
+            return json_response({"status": 502, "error": reviews["error"]})
+
         if not reviews:
             return json_response({"status": 404, "error": "No reviews found for this dealer"})
 
-        for review in reviews:
-            response = analyze_review_sentiments(review['review'])
-            review['sentiment'] = response.get('sentiment', "neutral")
+        _add_missing_sentiments(reviews)
 
         return json_response({"status": 200, "reviews": reviews})
     except Exception as e:
         logger.error(f"❌ Error fetching dealer reviews: {e}")
         return json_response({"status": 500, "error": "Failed to retrieve reviews"})
 
+def search_dealer_reviews(request):
+    """Ranked keyword search over reviews: `?q=` plus optional filters and the `limit`/`cursor` page."""
+    query = request.GET.get("q", "").strip()
+    if not query:
+        return json_response({"status": 400, "error": "q is required"}, status=400)
+
+    try:
+        filters = request.GET.dict()
+        filters.pop("q", None)
+        page = search_reviews(query, **filters)
+
+        if not isinstance(page, dict) or "error" in page:
+            return json_response({"status": 502, "error": page.get("error") if isinstance(page, dict) else "Bad response"})
+
+        return json_response({"status": 200, "reviews": page.get("items", []), "next_cursor": page.get("next_cursor")})
+    except Exception as e:
+        logger.error(f"❌ Error searching reviews: {e}")
+        return json_response({"status": 500, "error": "Failed to search reviews"})
+
+def get_dealer_review_summary(request, dealer_id):
+    """Serves the precomputed review aggregates for a dealer (one document read upstream)."""
+    try:
+        stats = get_review_stats(dealer_id)
+
+        if not isinstance(stats, dict) or "error" in stats:
+            return json_response({"status": 502, "error": stats.get("error") if isinstance(stats, dict) else "Bad response"})
+
+        return json_response({"status": 200, "summary": stats})
+    except Exception as e:
+        logger.error(f"❌ Error fetching review summary: {e}")
+        return json_response({"status": 500, "error": "Failed to retrieve review summary"})
+
+# ===== 🔎 Inventory Search =====
+
+def get_inventory(request, dealer_id):
+    """Searches a dealer's cars; filters and the `limit`/`cursor` page come from the query string."""
+    try:
+        page = search_cars(dealer_id, **request.GET.dict())
+
+        if not isinstance(page, dict) or "error" in page:
+            return json_response({"status": 502, "error": page.get("error") if isinstance(page, dict) else "Bad response"})
+
+        return json_response({"status": 200, "cars": page.get("items", []), "next_cursor": page.get("next_cursor")})
+    except Exception as e:
+        logger.error(f"❌ Error searching inventory: {e}")
+        return json_response({"status": 500, "error": "Failed to search inventory"})
+
+def get_inventory_facets(request, dealer_id):
+    """Per-make/model/year/body-type/mileage counts for a dealer and the current filters."""
+    try:
+        facets = get_car_facets(dealer_id, **request.GET.dict())
+
+        if not isinstance(facets, dict) or "error" in facets:
+            return json_response({"status": 502, "error": facets.get("error") if isinstance(facets, dict) else "Bad response"})
+
+        return json_response({"status": 200, "facets": facets})
+    except Exception as e:
+        logger.error(f"❌ Error fetching inventory facets: {e}")
+        return json_response({"status": 500, "error": "Failed to retrieve inventory facets"})
+
 # ===== 📝 Add a Dealer Review =====
 
 @csrf_exempt
@@ -176,6 +366,15 @@ def add_review(request):
     except json.JSONDecodeError:
         return json_response({"status": 400, "message": "Invalid JSON format"}, status=400)
 
+    # ✅ Score once at write time so reads never call the analyzer for this review
+    # (a client-supplied label is never trusted; unscored reviews are scored on read)
+    if isinstance(data, dict):
+        data.pop("sentiment", None)
+        if data.get("review"):
+            sentiment = get_sentiments([data["review"]], default=None)[0]
+            if sentiment:
+                data["sentiment"] = sentiment
+
     try:
         response = post_review(data)
 
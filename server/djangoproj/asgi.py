@@ -3,6 +3,11 @@ ASGI config for djangoproj project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Serve it with an ASGI server so the async API views (``djangoapp.async_views``)
+run on the event loop instead of blocking a worker thread per upstream call:
+
+    uvicorn djangoproj.asgi:application --host 0.0.0.0 --port 8000 --workers 4
+
 For more information on this file, see
 https://docs.djangoproject.com/en/3.2/howto/deployment/asgi/
 """
@@ -40,6 +40,7 @@ INSTALLED_APPS = [
 
 # ✅ Merged Middleware (Added WhiteNoise for Static Files)
 MIDDLEWARE = [
+    'djangoapp.metrics.MetricsMiddleware',  # ✅ First, so timings include sessions and auth
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # ✅ Static file optimization
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -92,6 +93,35 @@ DATABASES = {
     }
 }
 
+# ✅ Cache Configuration (shared Redis when REDIS_URL is set, otherwise per-process memory)
+SHARED_CACHE = bool(os.getenv('REDIS_URL'))
+if SHARED_CACHE:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('REDIS_URL'),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': {'MAX_ENTRIES': int(os.getenv('DJANGO_CACHE_MAX_ENTRIES', 10000))},
+        }
+    }
+
+# ✅ With a shared cache, sessions and users are read from it and written through to
+# the database. Per-process memory caches would let other workers keep a logged-out
+# or deactivated user, so without REDIS_URL sessions and users come from the database.
+# ModelBackend stays listed so sessions created under it keep validating.
+if SHARED_CACHE:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+    SESSION_CACHE_ALIAS = os.getenv('SESSION_CACHE_ALIAS', 'default')
+    AUTHENTICATION_BACKENDS = ['djangoapp.backends.CachedModelBackend', 'django.contrib.auth.backends.ModelBackend']
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.db'
+    AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+
 # ✅ Password Validators
 AUTH_PASSWORD_VALIDATORS = [
     {'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator'},
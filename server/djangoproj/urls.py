@@ -14,11 +14,16 @@ from django.views.generic import TemplateView
 from django.conf.urls.static import static
 from django.conf import settings
 from djangoapp import views  # ✅ Import views for API endpoints
+from djangoapp import async_views  # ✅ Async (ASGI) variants of the API views
+from djangoapp.metrics import metrics_view  # ✅ Prometheus scrape endpoint
 
 urlpatterns = [
     # ✅ ADMIN PANEL
     path('admin/', admin.site.urls),
 
+    # ✅ METRICS (Prometheus text format, per process)
+    path('metrics/', metrics_view, name='metrics'),
+
     # ✅ AUTHENTICATION ROUTES (🔧 FIXED: Use views instead of templates)
     path('login/', views.login_user, name='login'),  
     path('register/', views.register_user, name='register'),  
@@ -30,7 +35,12 @@ urlpatterns = [
     path('', TemplateView.as_view(template_name="Home.html")),  # ✅ Fix for home page
 
     # ✅ BACKEND API ROUTES (Django Serves JSON Responses)
+    path('api/get_cars/', views.get_cars, name='api_get_cars'),
     path('api/get_dealers/', views.get_dealerships, name='api_get_dealers'),  
+    path('api/get_dealers/invalidate/', views.invalidate_dealerships, name='api_invalidate_dealers'),
+    path('api/get_dealers/invalidate/<str:state>/', views.invalidate_dealerships, name='api_invalidate_dealers_by_state'),
+    path('api/get_dealers/<str:state>/', views.get_dealerships, name='api_get_dealers_by_state'),
+    path('api/dealers/near/', views.get_nearby_dealerships, name='api_dealers_near'),
     
     # 🔧 **COMMENTED OUT: `get_dealer_details` (Causing AttributeError)**
     # ❌ Original Issue: `views.get_dealer_details` does not exist
@@ -38,7 +48,17 @@ urlpatterns = [
     # path('api/dealer/<int:dealer_id>/', views.get_dealer_details, name='api_dealer_details'),  
 
     path('api/reviews/dealer/<int:dealer_id>/', views.get_dealer_reviews, name='api_dealer_reviews'),
+    path('api/reviews/search/', views.search_dealer_reviews, name='api_search_reviews'),
+    path('api/reviews/dealer/<int:dealer_id>/summary/', views.get_dealer_review_summary, name='api_dealer_review_summary'),
     path('api/add_review/', views.add_review, name='api_add_review'),
+    path('api/get_inventory/<int:dealer_id>/', views.get_inventory, name='api_get_inventory'),
+    path('api/get_inventory/<int:dealer_id>/facets/', views.get_inventory_facets, name='api_get_inventory_facets'),
+
+    # ✅ ASYNC API ROUTES (serve with an ASGI server, see djangoproj/asgi.py)
+    path('api/async/get_dealers/', async_views.get_dealerships_async, name='api_async_get_dealers'),
+    path('api/async/get_dealers/<str:state>/', async_views.get_dealerships_async, name='api_async_get_dealers_by_state'),
+    path('api/async/reviews/dealer/<int:dealer_id>/', async_views.get_dealer_reviews_async, name='api_async_dealer_reviews'),
+    path('api/async/add_review/', async_views.add_review_async, name='api_async_add_review'),
 
     # ✅ FRONTEND ROUTES (Handled by React)
     path('dealers/', TemplateView.as_view(template_name="Home.html")),  # ✅ FIX: Ensure correct template